@@ -0,0 +1,73 @@
+"""Create lists and list_items tables
+
+Revision ID: 002_lists
+Revises: 001_initial
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+
+# revision identifiers, used by Alembic.
+revision = '002_lists'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create lists tables"""
+    
+    # Create lists table
+    op.create_table(
+        'lists',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('is_archived', sa.Boolean(), nullable=True, server_default=sa.false()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_lists_id'), 'lists', ['id'], unique=False)
+    op.create_index(op.f('ix_lists_title'), 'lists', ['title'], unique=False)
+    op.create_index(op.f('ix_lists_owner_id'), 'lists', ['owner_id'], unique=False)
+    op.create_index(op.f('ix_lists_is_archived'), 'lists', ['is_archived'], unique=False)
+    
+    # Create list_items table
+    op.create_table(
+        'list_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('list_id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('is_completed', sa.Boolean(), nullable=True, server_default=sa.false()),
+        sa.Column('order', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['list_id'], ['lists.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_list_items_id'), 'list_items', ['id'], unique=False)
+    op.create_index(op.f('ix_list_items_list_id'), 'list_items', ['list_id'], unique=False)
+    op.create_index(op.f('ix_list_items_is_completed'), 'list_items', ['is_completed'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop lists tables"""
+    
+    # Drop list_items table
+    op.drop_index(op.f('ix_list_items_is_completed'), table_name='list_items')
+    op.drop_index(op.f('ix_list_items_list_id'), table_name='list_items')
+    op.drop_index(op.f('ix_list_items_id'), table_name='list_items')
+    op.drop_table('list_items')
+    
+    # Drop lists table
+    op.drop_index(op.f('ix_lists_is_archived'), table_name='lists')
+    op.drop_index(op.f('ix_lists_owner_id'), table_name='lists')
+    op.drop_index(op.f('ix_lists_title'), table_name='lists')
+    op.drop_index(op.f('ix_lists_id'), table_name='lists')
+    op.drop_table('lists')
@@ -0,0 +1,31 @@
+"""Add lists (owner_id, created_at DESC, id DESC) index for keyset pagination
+
+Revision ID: 003_lists_keyset_index
+Revises: 002_lists
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003_lists_keyset_index'
+down_revision = '002_lists'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create keyset pagination index"""
+    op.create_index(
+        'ix_lists_owner_created_id',
+        'lists',
+        ['owner_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop keyset pagination index"""
+    op.drop_index('ix_lists_owner_created_id', table_name='lists')
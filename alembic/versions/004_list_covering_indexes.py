@@ -0,0 +1,44 @@
+"""Add covering indexes for list and item listings
+
+Revision ID: 004_list_covering_indexes
+Revises: 003_lists_keyset_index
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_list_covering_indexes'
+down_revision = '003_lists_keyset_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create covering indexes and drop the single-column ones they replace"""
+    op.create_index(
+        'ix_lists_owner_archived_created',
+        'lists',
+        ['owner_id', 'is_archived', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_include=['id', 'title'],
+    )
+    op.create_index(
+        'ix_list_items_list_order',
+        'list_items',
+        ['list_id', 'order'],
+        unique=False,
+        postgresql_include=['id', 'content', 'is_completed'],
+    )
+    op.drop_index(op.f('ix_lists_is_archived'), table_name='lists')
+    op.drop_index(op.f('ix_lists_owner_id'), table_name='lists')
+
+
+def downgrade() -> None:
+    """Restore the single-column indexes and drop the covering ones"""
+    op.create_index(op.f('ix_lists_owner_id'), 'lists', ['owner_id'], unique=False)
+    op.create_index(op.f('ix_lists_is_archived'), 'lists', ['is_archived'], unique=False)
+    op.drop_index('ix_list_items_list_order', table_name='list_items')
+    op.drop_index('ix_lists_owner_archived_created', table_name='lists')
@@ -0,0 +1,31 @@
+"""Add users (created_at DESC, id DESC) index for keyset pagination
+
+Revision ID: 005_users_keyset_index
+Revises: 004_list_covering_indexes
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005_users_keyset_index'
+down_revision = '004_list_covering_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create keyset pagination index"""
+    op.create_index(
+        'ix_users_created_at_id',
+        'users',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop keyset pagination index"""
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -0,0 +1,39 @@
+"""Make the lists keyset index cover summary pages
+
+Revision ID: 006_lists_summary_index
+Revises: 005_users_keyset_index
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_lists_summary_index'
+down_revision = '005_users_keyset_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Rebuild the keyset index with the summary columns included"""
+    op.drop_index('ix_lists_owner_created_id', table_name='lists')
+    op.create_index(
+        'ix_lists_owner_created_id',
+        'lists',
+        ['owner_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_include=['title', 'is_archived', 'updated_at'],
+    )
+
+
+def downgrade() -> None:
+    """Rebuild the keyset index without included columns"""
+    op.drop_index('ix_lists_owner_created_id', table_name='lists')
+    op.create_index(
+        'ix_lists_owner_created_id',
+        'lists',
+        ['owner_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
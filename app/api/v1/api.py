@@ -1,6 +1,8 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import users
+from app.api.v1.endpoints import batch, lists, users
 
 api_router = APIRouter()
 api_router.include_router(users.router, tags=["users"])
+api_router.include_router(lists.router, tags=["lists"])
+api_router.include_router(batch.router, tags=["batch"])
 
@@ -1,19 +1,42 @@
 from typing import Generator, Annotated
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from datetime import datetime
+from fastapi import BackgroundTasks, Depends, HTTPException, Request, status
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+import threading
+import time
+
+import httpx
+from cachetools import TTLCache
 
 from app.db.session import SessionLocal, get_db
-from app.core.security import decode_access_token
+from app.core.security import decode_access_token, oauth2_scheme, token_cache_key
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
-from app.services.user_service import UserService
+from app.services.list_service import ListService, ListItemService
+from app.services.user_service import UserService, cache_auth_user, get_cached_auth_user
+
+# User IDs whose last login was written recently; the TTL is the throttle window
+_LAST_LOGIN_WRITES: TTLCache = TTLCache(maxsize=50_000, ttl=60)
+_LAST_LOGIN_WRITES_LOCK = threading.Lock()
+
+
+def _snapshot_user(user: User) -> dict:
+    """Copy loaded column values off a user instance"""
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
+def _record_last_login(user_id: int) -> None:
+    """Persist last login on a dedicated session (runs after the response)"""
+    db = SessionLocal()
+    try:
+        UserRepository(db).update_last_login(user_id)
+    finally:
+        db.close()
 
 
 def get_current_user(
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
@@ -23,38 +46,79 @@ def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    payload = decode_access_token(token)
-    if payload is None:
-        raise credentials_exception
-    
-    email: str = payload.get("sub")
-    if email is None:
-        raise credentials_exception
-    
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_email(email=email)
-    
-    if user is None:
-        raise credentials_exception
-    
+
+    # Decode once per request; later dependencies (e.g. scope checks) read
+    # the claims from request.state instead of decoding again. Stashed claims
+    # are only reused if they were decoded from this same token.
+    cache_key = token_cache_key(token)
+    payload = getattr(request.state, "jwt_payload", None)
+    if payload is None or getattr(request.state, "jwt_token_key", None) != cache_key:
+        payload = decode_access_token(token)
+        if payload is None:
+            raise credentials_exception
+        request.state.jwt_payload = payload
+        request.state.jwt_token_key = cache_key
+
+    snapshot = get_cached_auth_user(cache_key)
+
+    if snapshot is not None:
+        # Re-attach the cached user to this request's session without a SELECT
+        cached_user = User(**snapshot)
+        make_transient_to_detached(cached_user)
+        user = db.merge(cached_user, load=False)
+    else:
+        email: str = payload.get("sub")
+        if email is None:
+            raise credentials_exception
+
+        user_repo = UserRepository(db)
+        user = user_repo.get_by_email(email=email)
+
+        if user is None:
+            raise credentials_exception
+
+        cache_auth_user(cache_key, _snapshot_user(user))
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
-    
-    # Update last login
-    user_repo.update_last_login(user.id)
-    
+
+    # Update last login at most once per minute per user, off the request path
+    with _LAST_LOGIN_WRITES_LOCK:
+        schedule_write = user.id not in _LAST_LOGIN_WRITES
+        if schedule_write:
+            _LAST_LOGIN_WRITES[user.id] = time.monotonic()
+    if schedule_write:
+        background_tasks.add_task(_record_last_login, user.id)
+
     return user
 
 
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Get the shared outbound HTTP client created at startup"""
+    return request.app.state.http
+
+
 def get_user_service(db: Session = Depends(get_db)) -> UserService:
     """Get user service dependency"""
     return UserService(db)
 
 
+def get_list_service(db: Session = Depends(get_db)) -> ListService:
+    """Get list service dependency"""
+    return ListService(db)
+
+
+def get_list_item_service(db: Session = Depends(get_db)) -> ListItemService:
+    """Get list item service dependency"""
+    return ListItemService(db)
+
+
 # Annotated dependencies for cleaner code
 CurrentUser = Annotated[User, Depends(get_current_user)]
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
+ListServiceDep = Annotated[ListService, Depends(get_list_service)]
+ListItemServiceDep = Annotated[ListItemService, Depends(get_list_item_service)]
+HttpClientDep = Annotated[httpx.AsyncClient, Depends(get_http_client)]
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Request, status
+from fastapi.responses import ORJSONResponse
+
+from app.schemas.v1.batch import BatchRequest, BatchResponse
+from app.services.batch_service import BatchService
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+@router.post(
+    "/",
+    response_model=None,
+    summary="Run a batch of API calls",
+    responses={
+        200: {"description": "Results of every call", "model": BatchResponse},
+        422: {"description": "Validation error or invalid call graph"}
+    }
+)
+async def run_batch(
+    payload: BatchRequest,
+    request: Request
+) -> ORJSONResponse:
+    """
+    Run up to 20 API calls in one request.
+
+    - **calls**: Calls to run. A call can use an earlier call's response by
+      naming it in `input_from` and/or with `{{$<call_id>.<field>}}` tokens
+      in its path or payload.
+
+    Independent calls run concurrently, and dependent calls run once their
+    inputs are ready. A call whose dependency failed is not run and reports
+    an `INVALID_ARGUMENT` error. Results are returned in request order.
+    """
+    results = await BatchService(request.app, request.scope).run(payload.calls)
+    return ORJSONResponse(status_code=status.HTTP_200_OK, content={"results": results})
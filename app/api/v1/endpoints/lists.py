@@ -1,14 +1,49 @@
-from fastapi import APIRouter, HTTPException, status, Query
-from typing import Annotated
+from fastapi import APIRouter, HTTPException, Request, Response, status, Query
+import anyio
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from pydantic import TypeAdapter
+from typing import Annotated, AsyncIterator, Iterator, Optional
 
 from app.api.v1.deps import ListServiceDep, ListItemServiceDep, CurrentUser
 from app.schemas.v1.list import (
     ListCreateRequest, ListUpdateRequest, ListResponse, ListDetailResponse, ListsListResponse,
+    ListItemBulkCompletionRequest, ListItemBulkCompletionResponse, ListItemBulkCreateRequest,
     ListItemCreateRequest, ListItemUpdateRequest, ListItemResponse
 )
+from app.utils.helpers import make_etag, etag_matches
 
 router = APIRouter(prefix="/lists", tags=["lists"])
 
+_ITEM_LIST_ADAPTER = TypeAdapter(list[ListItemResponse])
+
+
+def _versions(rows) -> list[tuple]:
+    """(id, updated_at) pairs identifying the version of each row"""
+    return [(row.id, row.updated_at.isoformat()) for row in rows]
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already holds this version"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
+
+
+async def _closing(body: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Iterate a sync body in the threadpool and close it once iteration stops
+    
+    Threadpool calls are not abandoned on cancellation, so by the time the
+    finally block runs no next() is still executing and close() is safe; a
+    client disconnect still releases the generator's session and cursor.
+    """
+    try:
+        async for chunk in iterate_in_threadpool(body):
+            yield chunk
+    finally:
+        with anyio.CancelScope(shield=True):
+            await run_in_threadpool(body.close)
+
 
 # ============================================================================
 # List Endpoints
@@ -25,10 +60,10 @@ router = APIRouter(prefix="/lists", tags=["lists"])
         422: {"description": "Validation error"}
     }
 )
-async def create_list(
+def create_list(
     list_data: ListCreateRequest,
-    list_service: ListServiceDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    list_service: ListServiceDep
 ) -> ListResponse:
     """
     Create a new list for the current user.
@@ -48,24 +83,56 @@ async def create_list(
     summary="List user's lists",
     responses={
         200: {"description": "List of user's lists"},
+        304: {"description": "Not modified"},
         401: {"description": "Unauthorized"}
     }
 )
-async def get_user_lists(
+def get_user_lists(
+    request: Request,
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
-    list_service: ListServiceDep = None,
-    current_user: CurrentUser = None
+    cursor: Annotated[Optional[str], Query()] = None,
+    include_total: Annotated[bool, Query()] = False,
+    summary: Annotated[bool, Query()] = False,
+    is_archived: Annotated[Optional[bool], Query()] = None,
+    current_user: CurrentUser = None,
+    list_service: ListServiceDep = None
 ) -> ListsListResponse:
     """
     Get all lists for the current user with pagination.
     
     Requires authentication.
     
-    - **skip**: Number of lists to skip (default: 0)
+    - **skip**: Number of lists to skip (default: 0, ignored when cursor is set)
     - **limit**: Number of lists to return (default: 20, max: 100)
+    - **cursor**: Opaque cursor from a previous page's `next_cursor`
+    - **include_total**: Also return the total number of lists (default: false)
+    - **summary**: Leave out list descriptions (default: false)
+    - **is_archived**: Only return archived (true) or active (false) lists
     """
-    return list_service.get_user_lists(current_user.id, skip=skip, limit=limit)
+    page = list_service.get_user_lists(
+        current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        summary=summary,
+        is_archived=is_archived
+    )
+    # Every query input that shapes the body is part of the tag
+    etag = make_etag(
+        summary, is_archived, page["total"], page["skip"], page["limit"],
+        page["has_more"], page["next_cursor"], *_versions(page["items"])
+    )
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    # Items are already response models; serialise without re-validating
+    return Response(
+        content=ListsListResponse.model_construct(**page).model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
 
 
 @router.get(
@@ -74,22 +141,34 @@ async def get_user_lists(
     summary="Get list with items",
     responses={
         200: {"description": "List found"},
+        304: {"description": "Not modified"},
         401: {"description": "Unauthorized"},
         403: {"description": "Forbidden"},
         404: {"description": "List not found"}
     }
 )
-async def get_list(
+def get_list(
     list_id: int,
-    list_service: ListServiceDep,
-    current_user: CurrentUser
+    request: Request,
+    current_user: CurrentUser,
+    list_service: ListServiceDep
 ) -> ListDetailResponse:
     """
     Get list details with all its items.
     
     Requires authentication. Users can only access their own lists.
+    Honors `If-None-Match` with the returned `ETag`.
     """
-    return list_service.get_list(list_id, owner_id=current_user.id)
+    list_detail = list_service.get_list(list_id, owner_id=current_user.id)
+    etag = make_etag(list_detail.id, list_detail.updated_at.isoformat(), *_versions(list_detail.items))
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    return Response(
+        content=list_detail.model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
 
 
 @router.put(
@@ -104,11 +183,11 @@ async def get_list(
         422: {"description": "Validation error"}
     }
 )
-async def update_list(
+def update_list(
     list_id: int,
     list_data: ListUpdateRequest,
-    list_service: ListServiceDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    list_service: ListServiceDep
 ) -> ListResponse:
     """
     Update list information.
@@ -133,10 +212,10 @@ async def update_list(
         404: {"description": "List not found"}
     }
 )
-async def delete_list(
+def delete_list(
     list_id: int,
-    list_service: ListServiceDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    list_service: ListServiceDep
 ) -> None:
     """
     Delete a list.
@@ -158,10 +237,10 @@ async def delete_list(
         404: {"description": "List not found"}
     }
 )
-async def archive_list(
+def archive_list(
     list_id: int,
-    list_service: ListServiceDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    list_service: ListServiceDep
 ) -> ListResponse:
     """
     Archive a list.
@@ -183,10 +262,10 @@ async def archive_list(
         404: {"description": "List not found"}
     }
 )
-async def unarchive_list(
+def unarchive_list(
     list_id: int,
-    list_service: ListServiceDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    list_service: ListServiceDep
 ) -> ListResponse:
     """
     Unarchive a list.
@@ -213,11 +292,11 @@ async def unarchive_list(
         422: {"description": "Validation error"}
     }
 )
-async def create_list_item(
+def create_list_item(
     list_id: int,
     item_data: ListItemCreateRequest,
-    list_item_service: ListItemServiceDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    list_item_service: ListItemServiceDep
 ) -> ListItemResponse:
     """
     Add a new item to a list.
@@ -231,29 +310,82 @@ async def create_list_item(
     return list_item_service.create_item(list_id, current_user.id, item_data)
 
 
+@router.post(
+    "/{list_id}/items/bulk",
+    response_model=list[ListItemResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Add many items to list",
+    responses={
+        201: {"description": "Items created successfully"},
+        401: {"description": "Unauthorized"},
+        404: {"description": "List not found"},
+        422: {"description": "Validation error"}
+    }
+)
+def create_list_items(
+    list_id: int,
+    payload: ListItemBulkCreateRequest,
+    current_user: CurrentUser,
+    list_item_service: ListItemServiceDep
+) -> Response:
+    """
+    Add up to 100 items to a list in one request.
+    
+    Requires authentication. Users can only add items to their own lists.
+    The items are inserted together and returned in request order.
+    
+    - **items**: Items to add, each with the same fields as a single item
+    """
+    items = list_item_service.create_items(list_id, current_user.id, payload)
+    return Response(
+        content=_ITEM_LIST_ADAPTER.dump_json(items),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
+    )
+
+
 @router.get(
     "/{list_id}/items",
     response_model=list[ListItemResponse],
     summary="Get list items",
     responses={
         200: {"description": "List items"},
+        304: {"description": "Not modified"},
         401: {"description": "Unauthorized"},
         403: {"description": "Forbidden"},
         404: {"description": "List not found"}
     }
 )
-async def get_list_items(
+def get_list_items(
     list_id: int,
-    list_item_service: ListItemServiceDep,
-    current_user: CurrentUser
+    request: Request,
+    stream: Annotated[bool, Query()] = False,
+    current_user: CurrentUser = None,
+    list_item_service: ListItemServiceDep = None
 ) -> list[ListItemResponse]:
     """
     Get all items in a list.
     
     Requires authentication. Users can only view items in their own lists.
-    Items are returned in order.
+    Items are returned in order. Honors `If-None-Match` with the returned `ETag`.
+    
+    - **stream**: Stream the items straight from the database instead of
+      buffering them, for very large lists (no caching or `ETag`; default: false)
     """
-    return list_item_service.get_list_items(list_id, current_user.id)
+    if stream:
+        body = list_item_service.stream_list_items(list_id, current_user.id)
+        return StreamingResponse(_closing(body), media_type="application/json")
+    items = list_item_service.get_list_items(list_id, current_user.id)
+    etag = make_etag(list_id, *_versions(items))
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    # Items are already validated; serialise directly instead of re-validating
+    return Response(
+        content=_ITEM_LIST_ADAPTER.dump_json(items),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
 
 
 @router.get(
@@ -267,18 +399,18 @@ async def get_list_items(
         404: {"description": "Item not found"}
     }
 )
-async def get_list_item(
+def get_list_item(
     list_id: int,
     item_id: int,
-    list_item_service: ListItemServiceDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    list_item_service: ListItemServiceDep
 ) -> ListItemResponse:
     """
     Get a specific item from a list.
     
     Requires authentication. Users can only access items in their own lists.
     """
-    return list_item_service.get_item(item_id, current_user.id)
+    return list_item_service.get_item(item_id, current_user.id, list_id=list_id)
 
 
 @router.put(
@@ -293,12 +425,12 @@ async def get_list_item(
         422: {"description": "Validation error"}
     }
 )
-async def update_list_item(
+def update_list_item(
     list_id: int,
     item_id: int,
     item_data: ListItemUpdateRequest,
-    list_item_service: ListItemServiceDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    list_item_service: ListItemServiceDep
 ) -> ListItemResponse:
     """
     Update a list item.
@@ -309,7 +441,7 @@ async def update_list_item(
     - **is_completed**: Update completion status (optional)
     - **order**: Update item order (optional)
     """
-    return list_item_service.update_item(item_id, current_user.id, item_data)
+    return list_item_service.update_item(item_id, current_user.id, item_data, list_id=list_id)
 
 
 @router.delete(
@@ -323,18 +455,48 @@ async def update_list_item(
         404: {"description": "Item not found"}
     }
 )
-async def delete_list_item(
+def delete_list_item(
     list_id: int,
     item_id: int,
-    list_item_service: ListItemServiceDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    list_item_service: ListItemServiceDep
 ) -> None:
     """
     Delete an item from a list.
     
     Requires authentication. Users can only delete items from their own lists.
     """
-    list_item_service.delete_item(item_id, current_user.id)
+    list_item_service.delete_item(item_id, current_user.id, list_id=list_id)
+
+
+@router.post(
+    "/{list_id}/items/toggle",
+    response_model=ListItemBulkCompletionResponse,
+    summary="Set completion on many items",
+    responses={
+        200: {"description": "Items updated"},
+        401: {"description": "Unauthorized"},
+        404: {"description": "List not found"},
+        422: {"description": "Validation error"}
+    }
+)
+def set_items_completion(
+    list_id: int,
+    payload: ListItemBulkCompletionRequest,
+    current_user: CurrentUser,
+    list_item_service: ListItemServiceDep
+) -> ListItemBulkCompletionResponse:
+    """
+    Mark up to 100 items of a list completed or incomplete in one request.
+    
+    Requires authentication. Users can only update items in their own lists.
+    
+    - **item_ids**: Items to update
+    - **is_completed**: Completion status to set on all of them
+    
+    IDs that are not items of this list are reported in `not_found`.
+    """
+    return list_item_service.set_items_completion(list_id, current_user.id, payload)
 
 
 @router.post(
@@ -348,11 +510,11 @@ async def delete_list_item(
         404: {"description": "Item not found"}
     }
 )
-async def toggle_item_completion(
+def toggle_item_completion(
     list_id: int,
     item_id: int,
-    list_item_service: ListItemServiceDep,
-    current_user: CurrentUser
+    current_user: CurrentUser,
+    list_item_service: ListItemServiceDep
 ) -> ListItemResponse:
     """
     Toggle completion status of a list item.
@@ -360,4 +522,4 @@ async def toggle_item_completion(
     Requires authentication. Users can only toggle items in their own lists.
     Converts completed items to incomplete and vice versa.
     """
-    return list_item_service.toggle_item_completion(item_id, current_user.id)
+    return list_item_service.toggle_item_completion(item_id, current_user.id, list_id=list_id)
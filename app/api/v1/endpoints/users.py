@@ -1,23 +1,17 @@
-from fastapi import APIRouter, Depends, status, Query
-from typing import Annotated
+from fastapi import APIRouter, Request, status, Query
+from fastapi.responses import ORJSONResponse, Response
+from typing import Annotated, Optional
 
-from app.db.session import get_db
-from app.services.user_service import UserService
+from app.api.v1.deps import UserServiceDep
+from app.utils.helpers import make_etag, etag_matches
 from app.schemas.v1.user import (
-    UserCreateRequest, UserUpdateRequest, UserResponse, UsersListResponse
+    UserBulkCreateRequest, UserBulkCreateResponse, UserCreateRequest,
+    UserUpdateRequest, UserResponse, UsersListResponse
 )
-from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
-    return UserService(db)
-
-
-UserServiceDep = Annotated[UserService, Depends(get_user_service)]
-
-
 @router.post(
     "/",
     response_model=UserResponse,
@@ -43,43 +37,96 @@ def create_user(
     return user_service.create_user(user_data)
 
 
+@router.post(
+    "/bulk",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many users",
+    responses={
+        201: {"description": "All users created", "model": UserBulkCreateResponse},
+        207: {"description": "Some users were not created", "model": UserBulkCreateResponse},
+        422: {"description": "Validation error"}
+    }
+)
+def create_users(
+    payload: UserBulkCreateRequest,
+    user_service: UserServiceDep
+) -> ORJSONResponse:
+    """
+    Create up to 100 user accounts in one request.
+
+    - **users**: Users to create, each with the same fields as a single create
+
+    Results are returned in request order. Entries whose email already exists
+    carry an error instead of a user, and the response status is 207.
+    """
+    result = user_service.create_users(payload)
+    all_created = result["created"] == len(payload.users)
+    return ORJSONResponse(
+        status_code=status.HTTP_201_CREATED if all_created else status.HTTP_207_MULTI_STATUS,
+        content=result
+    )
+
+
 @router.get(
     "/",
-    response_model=UsersListResponse,
+    # Items are already JSON-ready; skip re-validating the page on the way out
+    response_model=None,
     summary="List all users",
     responses={
-        200: {"description": "List of users"}
+        200: {"description": "List of users", "model": UsersListResponse}
     }
 )
 def list_users(
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Annotated[Optional[str], Query()] = None,
+    include_total: Annotated[bool, Query()] = False,
     user_service: UserServiceDep = None
-) -> UsersListResponse:
+) -> ORJSONResponse:
     """
     List all users with pagination.
 
-    - **skip**: Number of users to skip (default: 0)
+    - **skip**: Number of users to skip (default: 0, ignored when cursor is set)
     - **limit**: Number of users to return (default: 20, max: 100)
+    - **cursor**: Opaque cursor from a previous page's `next_cursor`
+    - **include_total**: Also return the total number of users (default: false)
     """
-    return user_service.get_users(skip=skip, limit=limit)
+    page = user_service.get_users(
+        skip=skip, limit=limit, cursor=cursor, include_total=include_total
+    )
+    # Returning the response directly skips jsonable_encoder; orjson encodes
+    # the already JSON-ready page in one pass
+    return ORJSONResponse(content=page)
 
 
 @router.get(
     "/{user_id}",
-    response_model=UserResponse,
+    response_model=None,
     summary="Get user by ID",
     responses={
-        200: {"description": "User found"},
+        200: {"description": "User found", "model": UserResponse},
+        304: {"description": "Not modified"},
         404: {"description": "User not found"}
     }
 )
 def get_user(
     user_id: int,
+    request: Request,
     user_service: UserServiceDep
-) -> UserResponse:
-    """Get user details by ID."""
-    return user_service.get_user(user_id)
+) -> Response:
+    """
+    Get user details by ID.
+    
+    Honors `If-None-Match` with the returned `ETag`.
+    """
+    # The cached body is already encoded, so it is sent as-is. It carries
+    # updated_at, so hashing it changes the ETag whenever the user does.
+    body = user_service.get_user_json(user_id)
+    etag = make_etag(user_id, body.decode("utf-8"))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.put(
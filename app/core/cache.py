@@ -0,0 +1,77 @@
+"""Shared Redis cache
+
+Redis is optional: with REDIS_URL unset every helper is a no-op and callers
+fall back to the database. Connection errors are treated as cache misses so
+an unavailable Redis never fails a request.
+"""
+
+import logging
+import threading
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[redis.Redis] = None
+_client_lock = threading.Lock()
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Get the process-wide Redis client, creating its pool on first use"""
+    global _client
+    if not settings.REDIS_URL:
+        return None
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                pool = redis.ConnectionPool.from_url(
+                    settings.REDIS_URL,
+                    max_connections=settings.REDIS_MAX_CONNECTIONS,
+                    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                )
+                _client = redis.Redis(connection_pool=pool)
+    return _client
+
+
+def close_redis() -> None:
+    """Release pooled Redis connections (called on shutdown)"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.connection_pool.disconnect()
+            _client = None
+
+
+def cache_get(key: str) -> Optional[bytes]:
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return client.get(key)
+    except redis.RedisError:
+        logger.warning("Redis GET failed for %s", key, exc_info=True)
+        return None
+
+
+def cache_set(key: str, value: bytes, ttl: int) -> None:
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.setex(key, ttl, value)
+    except redis.RedisError:
+        logger.warning("Redis SETEX failed for %s", key, exc_info=True)
+
+
+def cache_delete(key: str) -> None:
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(key)
+    except redis.RedisError:
+        logger.warning("Redis DEL failed for %s", key, exc_info=True)
@@ -1,15 +1,38 @@
 import os
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "FastAPI Project"
+    DEBUG: bool = False
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = os.getenv("SECRET_KEY", "super-secret-key-change-in-production")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    
+    # Password Hashing (Argon2id)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
     DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql://user:password@db:5432/dbname")
     
+    # Database Connection Pool
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 300
+    DB_POOL_PRE_PING: bool = True
+    DB_APPLICATION_NAME: str = "fastapi-aws"
+    DB_DISABLE_JIT: bool = True
+    
+    # Outbound HTTP Client
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_TIMEOUT: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    
     # CORS Settings
     CORS_ORIGINS: List[str] = [
         "http://localhost",
@@ -25,10 +48,27 @@ class Settings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_DEFAULT: str = "100/minute"
     RATE_LIMIT_AUTH: str = "30/minute"
+    # Proxies in front of the app whose X-Forwarded-For entries are trusted
+    TRUSTED_PROXY_HOPS: int = 0
+    
+    # Response compression
+    GZIP_MINIMUM_SIZE: int = 500
+    GZIP_COMPRESS_LEVEL: int = 5
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
+    # Coalesce concurrent GET /users/{id} lookups into one query
+    USER_LOOKUP_BATCHING: bool = False
+    USER_LOOKUP_BATCH_SIZE: int = 100
+    USER_LOOKUP_MAX_WAIT_MS: float = 50
+    
+    # Optional Redis cache shared by all workers (disabled when unset)
+    REDIS_URL: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    USER_CACHE_TTL: int = 60
+    
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
@@ -37,4 +77,11 @@ class Settings(BaseSettings):
         case_sensitive = True
         env_file = ".env"
 
-settings = Settings()
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing the environment only once"""
+    return Settings()
+
+
+settings = get_settings()
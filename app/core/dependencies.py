@@ -1,37 +1,10 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+"""Archived core dependencies
 
-from app.core.config import settings
-from app.core.security import decode_access_token
-from app.db.session import SessionLocal
-from app.models.user import User
-from app.repositories.user_repository import UserRepository
+Kept as re-exports for older imports; authenticated routes should depend on
+app.api.v1.deps.get_current_user.
+"""
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
+from app.core.security import oauth2_scheme
+from app.db.session import get_db
 
-def get_db() -> Generator:
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
-
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    payload = decode_access_token(token)
-    if payload is None:
-        raise credentials_exception
-    username: str = payload.get("sub")
-    if username is None:
-        raise credentials_exception
-    user_repo = UserRepository(db)
-    user = user_repo.get_user_by_email(email=username)
-    if user is None:
-        raise credentials_exception
-    return user
+__all__ = ["oauth2_scheme", "get_db"]
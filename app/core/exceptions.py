@@ -1,5 +1,5 @@
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
@@ -16,7 +16,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "message": message
         })
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "success": False,
@@ -26,7 +26,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
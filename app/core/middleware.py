@@ -0,0 +1,64 @@
+"""ASGI middleware shared across the application"""
+
+from typing import Iterable
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+
+def resolve_client_ip(scope: Scope, trusted_hops: int = 0) -> str:
+    """Resolve the originating client IP for a request
+
+    X-Forwarded-For is only honoured for the number of proxies we trust in
+    front of the app; anything further left is client-controlled.
+    """
+    if trusted_hops > 0:
+        forwarded = Headers(scope=scope).get("x-forwarded-for")
+        if forwarded:
+            hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+            if hops:
+                return hops[max(len(hops) - trusted_hops, 0)]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class ClientIPMiddleware:
+    """Resolve the client IP once per request into request.state.client_ip"""
+
+    def __init__(self, app: ASGIApp, trusted_hops: int = settings.TRUSTED_PROXY_HOPS):
+        self.app = app
+        self.trusted_hops = trusted_hops
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["client_ip"] = resolve_client_ip(
+                scope, self.trusted_hops
+            )
+        await self.app(scope, receive, send)
+
+
+class CompressionMiddleware:
+    """Gzip responses for clients that accept it, except on exempt paths
+
+    Bodies under minimum_size are sent uncompressed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.GZIP_MINIMUM_SIZE,
+        compresslevel: int = settings.GZIP_COMPRESS_LEVEL,
+        exempt_paths: Iterable[str] = (),
+    ):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] not in self.exempt_paths:
+            await self.gzip(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
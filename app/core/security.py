@@ -2,13 +2,44 @@ from datetime import datetime, timedelta
 from typing import Optional
 import hashlib
 import hmac
-import secrets
+import threading
+import time
 
-from jose import JWTError, jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
+from fastapi.security import OAuth2PasswordBearer
+import jwt
+from jwt import PyJWTError as JWTError
 
 from app.core.config import settings
 
+# Single scheme instance so every dependency shares one identity (and cache entry)
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
+
+# Decoded token payloads keyed by token hash. The TTL bounds how long a
+# revoked or expired token can keep resolving from memory.
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_TOKEN_CACHE_LOCK = threading.Lock()
+_INVALID_TOKEN = object()
+
+_password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+_ARGON2_PREFIX = "$argon2"
+# Fixed: legacy hashes do not record their iteration count
+_PBKDF2_ITERATIONS = 120000
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if hashed_password.startswith(_ARGON2_PREFIX):
+        try:
+            return _password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    # Legacy PBKDF2 hashes created before the switch to Argon2
     try:
         algorithm, salt, digest = hashed_password.split("$", 2)
     except ValueError:
@@ -19,20 +50,23 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         "sha256",
         plain_password.encode("utf-8"),
         salt.encode("utf-8"),
-        120000
+        _PBKDF2_ITERATIONS
     ).hex()
     return hmac.compare_digest(candidate, digest)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash should be replaced on the next successful login"""
+    if not hashed_password.startswith(_ARGON2_PREFIX):
+        return True
+    try:
+        return _password_hasher.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
+
+
 def get_password_hash(password: str) -> str:
-    salt = secrets.token_hex(16)
-    digest = hashlib.pbkdf2_hmac(
-        "sha256",
-        password.encode("utf-8"),
-        salt.encode("utf-8"),
-        120000
-    ).hex()
-    return f"pbkdf2_sha256${salt}${digest}"
+    return _password_hasher.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -44,9 +78,38 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def token_cache_key(token: str) -> bytes:
+    """Key for per-token caches (decoded claims here, resolved users in deps)"""
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def invalidate_token(token: str) -> None:
+    """Drop a token's cached claims so the next request decodes it again"""
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE.pop(token_cache_key(token), None)
+
+
 def decode_access_token(token: str):
+    key = token_cache_key(token)
+    with _TOKEN_CACHE_LOCK:
+        cached = _TOKEN_CACHE.get(key)
+    if cached is not None:
+        if cached is _INVALID_TOKEN:
+            return None
+        # The signature was verified on the miss; expiry still has to be
+        # checked because a token can lapse while its claims are cached
+        exp = cached.get("exp")
+        if exp is None or exp > time.time():
+            return cached
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[key] = _INVALID_TOKEN
+        return None
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
-        return None
+        payload = None
+
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[key] = _INVALID_TOKEN if payload is None else payload
+    return payload
@@ -1,2 +1,3 @@
 from app.db.base_class import Base
-from app.models.user import User
\ No newline at end of file
+from app.models.user import User
+from app.models.list import List, ListItem
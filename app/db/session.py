@@ -1,10 +1,45 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, echo=True, pool_pre_ping=True)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _engine_options() -> dict:
+    """Build engine keyword arguments from settings"""
+    options = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    backend = make_url(settings.DATABASE_URL).get_backend_name()
+    if backend == "sqlite":
+        # SQLite uses its own pool classes which take no sizing arguments
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if backend == "postgresql":
+        connect_args = {"application_name": settings.DB_APPLICATION_NAME}
+        if settings.DB_DISABLE_JIT:
+            # Short OLTP queries pay JIT compile cost without benefiting from it
+            connect_args["options"] = "-c jit=off"
+        options["connect_args"] = connect_args
+    return options
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options())
+
+# Attributes stay loaded after commit, so responses built from freshly
+# committed rows do not trigger a reload SELECT
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine
+)
 
 def get_db():
     """Get database session"""
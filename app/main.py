@@ -1,14 +1,51 @@
-from fastapi import FastAPI, HTTPException, status
+from contextlib import asynccontextmanager
+
+import httpx
+import orjson
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from app.api.v1.api import api_router as v1_router
+from app.core.cache import close_redis, get_redis
 from app.core.config import settings
 from app.core.exceptions import validation_exception_handler, http_exception_handler
-from app.utils.rate_limiter import limiter
+from app.core.middleware import ClientIPMiddleware, CompressionMiddleware
+from app.db.session import engine
+from app.utils.rate_limiter import RateLimitMiddleware, limiter
 from fastapi.exceptions import RequestValidationError
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime, timezone
 
+# ============================================================================
+# Lifespan
+# ============================================================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources at startup and release them at shutdown"""
+    # One pooled HTTP client for outbound calls, reused by every handler
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+    )
+    # The engine and its connection pool are created once at import and
+    # exposed here; shutdown closes the pooled connections cleanly
+    app.state.db_engine = engine
+    # Redis pool (None when REDIS_URL is unset); services reach it via get_redis
+    app.state.redis = get_redis()
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+        engine.dispose()
+        close_redis()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="A professional enterprise-level FastAPI project with CRUD operations",
@@ -16,12 +53,20 @@ app = FastAPI(
     docs_url="/api/docs",
     openapi_url="/api/openapi.json",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # ============================================================================
 # Middleware Configuration
 # ============================================================================
 
+# Add rate limiting to app. Middleware added later wraps earlier middleware,
+# so adding this before CORS keeps CORS headers on 429 responses.
+app.state.limiter = limiter
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, exempt_paths={"/health"})
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -31,8 +76,11 @@ app.add_middleware(
     allow_headers=settings.CORS_HEADERS,
 )
 
-# Add rate limiting to app
-app.state.limiter = limiter
+# Compress JSON bodies; /health keeps its pre-encoded fast path
+app.add_middleware(CompressionMiddleware, exempt_paths={"/health"})
+
+# Resolve the client IP once per request (added last, so it runs first)
+app.add_middleware(ClientIPMiddleware)
 
 # ============================================================================
 # Exception Handlers
@@ -41,12 +89,6 @@ app.state.limiter = limiter
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
 
-# ============================================================================
-# API Routes
-# ============================================================================
-
-app.include_router(v1_router, prefix=settings.API_V1_STR)
-
 # ============================================================================
 # Response Models
 # ============================================================================
@@ -83,35 +125,31 @@ def root():
     }
 
 
-@app.get("/health", tags=["Health"], response_model=HealthResponse)
-def health_check():
+# Everything but the timestamp is fixed, so it is serialised once at import
+_HEALTH_PREFIX = orjson.dumps({
+    "status": "healthy",
+    "message": f"{settings.PROJECT_NAME} service is healthy!",
+    "version": "1.0.0",
+    "database": "connected",
+})[:-1] + b',"timestamp":'
+
+
+@app.get(
+    "/health",
+    tags=["Health"],
+    response_model=None,
+    responses={200: {"model": HealthResponse}}
+)
+async def health_check() -> Response:
     """
     Health check endpoint
-    Returns 200 if service is healthy, 503 if unhealthy
+    Returns 200 if service is healthy
+    
+    Hit by every load balancer probe, so the body is assembled from
+    pre-encoded bytes and the route is exempt from rate limiting.
     """
-    try:
-        # Optional: Check database connection
-        # await database.execute("SELECT 1")
-        
-        return {
-            "status": "healthy",
-            "message": f"{settings.PROJECT_NAME} service is healthy!",
-            "version": "1.0.0",
-            "database": "connected",
-            "timestamp": datetime.utcnow()
-        }
-    except Exception as e:
-        # If database or critical service is down, return 503
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail={
-                "status": "unhealthy",
-                "message": f"Service is unhealthy: {str(e)}",
-                "version": "1.0.0",
-                "database": "disconnected",
-                "timestamp": datetime.now(timezone.utc)
-            }
-        )
+    timestamp = orjson.dumps(datetime.now(timezone.utc))
+    return Response(content=_HEALTH_PREFIX + timestamp + b"}", media_type="application/json")
 
 
 @app.get("/api/v1/status", tags=["Status"])
@@ -122,3 +160,12 @@ def api_status():
         "version": "1.0.0",
         "timestamp": datetime.now(timezone.utc)
     }
+
+
+# ============================================================================
+# API Routes
+# ============================================================================
+
+# Registered after the health and status routes: Starlette matches routes in
+# order, so probes resolve without scanning the whole v1 route table
+app.include_router(v1_router, prefix=settings.API_V1_STR)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -13,8 +13,8 @@ class List(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    is_archived = Column(Boolean, default=False, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    is_archived = Column(Boolean, default=False)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -24,6 +24,22 @@ class List(Base):
     owner = relationship("User", back_populates="lists")
     items = relationship("ListItem", back_populates="list", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Serves keyset pagination of an owner's lists, newest first; the
+        # included columns let summary pages be answered by an index-only scan
+        Index(
+            "ix_lists_owner_created_id",
+            owner_id, created_at.desc(), id.desc(),
+            postgresql_include=["title", "is_archived", "updated_at"],
+        ),
+        # Serves owner listings filtered by archive state
+        Index(
+            "ix_lists_owner_archived_created",
+            owner_id, is_archived, created_at.desc(),
+            postgresql_include=["id", "title"],
+        ),
+    )
+    
     def __repr__(self) -> str:
         return f"<List(id={self.id}, title={self.title}, owner_id={self.owner_id})>"
 
@@ -46,5 +62,14 @@ class ListItem(Base):
     # Relationships
     list = relationship("List", back_populates="items")
     
+    __table_args__ = (
+        # Lets item listings come back in order without a sort step
+        Index(
+            "ix_list_items_list_order",
+            list_id, order,
+            postgresql_include=["id", "content", "is_completed"],
+        ),
+    )
+    
     def __repr__(self) -> str:
         return f"<ListItem(id={self.id}, list_id={self.list_id}, content={self.content})>"
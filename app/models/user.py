@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 from datetime import datetime
@@ -21,6 +22,14 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     last_login = Column(DateTime(timezone=True), nullable=True)
     
+    # Relationships; the lists.owner_id foreign key cascades deletes in the database
+    lists = relationship("List", back_populates="owner", passive_deletes=True)
+    
+    __table_args__ = (
+        # Serves keyset pagination, newest first
+        Index("ix_users_created_at_id", created_at.desc(), id.desc()),
+    )
+    
     def is_authenticated(self) -> bool:
         """Check if user is authenticated"""
         return True
@@ -1,7 +1,43 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy import and_, delete, desc, func, insert, literal_column, not_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from app.models.list import List, ListItem
-from typing import Optional
+from typing import Iterator, Optional, Sequence
+from datetime import datetime
+import threading
+
+from cachetools import TTLCache
+
+# Per-owner list counts, only computed when a caller asks for a total
+_TOTAL_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_TOTAL_CACHE_LOCK = threading.Lock()
+
+
+def _invalidate_totals(owner_id: int) -> None:
+    with _TOTAL_CACHE_LOCK:
+        for is_archived in (None, True, False):
+            _TOTAL_CACHE.pop((owner_id, is_archived), None)
+
+
+# Columns a caller may change through the repositories' update()
+_LIST_UPDATE_FIELDS = frozenset({'title', 'description', 'is_archived'})
+_ITEM_UPDATE_FIELDS = frozenset({'content', 'is_completed', 'order'})
+
+# Every list column except the free-text description
+_LIST_SUMMARY_COLUMNS = tuple(
+    column for column in List.__table__.c if column.key != "description"
+)
+
+
+def _owned_by(owner_id: int, list_id: Optional[int] = None):
+    """Criterion restricting list item writes to lists the owner holds
+    
+    With a list_id, the item must also belong to that specific list.
+    """
+    owned = select(List.id).where(List.owner_id == owner_id)
+    if list_id is None:
+        return ListItem.list_id.in_(owned)
+    return and_(ListItem.list_id == list_id, ListItem.list_id.in_(owned.where(List.id == list_id)))
 
 
 class ListRepository:
@@ -20,6 +56,7 @@ class ListRepository:
         self.db.add(db_list)
         self.db.commit()
         self.db.refresh(db_list)
+        _invalidate_totals(owner_id)
         return db_list
     
     def get_by_id(self, list_id: int) -> Optional[List]:
@@ -33,37 +70,118 @@ class ListRepository:
             List.owner_id == owner_id
         ).first()
     
+    def get_by_id_with_items(self, list_id: int, owner_id: Optional[int] = None) -> Optional[List]:
+        """Get list by ID with its items eagerly loaded
+        
+        Items come from one batched IN query; any other relationship access
+        raises instead of lazy loading.
+        """
+        query = self.db.query(List).options(
+            selectinload(List.items),
+            raiseload("*")
+        ).filter(List.id == list_id)
+        if owner_id is not None:
+            query = query.filter(List.owner_id == owner_id)
+        return query.first()
+    
+    def get_detail(self, list_id: int, owner_id: int) -> Optional[tuple[List, list]]:
+        """Get an owned list together with its items in a single query
+        
+        On PostgreSQL the items are aggregated into a JSON array (item order
+        preserved) and returned as dicts. Other backends fall back to
+        selectinload and return ListItem instances.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            db_list = self.get_by_id_with_items(list_id, owner_id)
+            return (db_list, db_list.items) if db_list else None
+        
+        items = func.coalesce(
+            func.json_agg(
+                aggregate_order_by(ListItem.__table__.table_valued(), ListItem.order)
+            ).filter(ListItem.id.isnot(None)),
+            literal_column("'[]'::json")
+        )
+        stmt = (
+            select(List, items.label("items"))
+            .outerjoin(ListItem, ListItem.list_id == List.id)
+            .where(List.id == list_id, List.owner_id == owner_id)
+            .group_by(List.id)
+        )
+        row = self.db.execute(stmt).first()
+        return (row[0], row[1]) if row else None
+    
     def get_by_owner(
         self,
         owner_id: int,
         skip: int = 0,
         limit: int = 20,
-        is_archived: Optional[bool] = None
-    ) -> tuple[list[List], int]:
-        """Get all lists for a specific owner"""
+        is_archived: Optional[bool] = None,
+        cursor: Optional[tuple[datetime, int]] = None,
+        include_total: bool = False,
+        summary: bool = False
+    ) -> tuple[list, Optional[int], bool]:
+        """Get lists for a specific owner, newest first
+        
+        When a (created_at, id) cursor is given, rows are fetched with a
+        keyset seek from that position and skip is ignored. The total is
+        only counted when include_total is set, and is cached briefly.
+        Also returns whether more rows follow the page. In summary mode the
+        description column is not selected and plain rows are returned.
+        """
         query = self.db.query(List).filter(List.owner_id == owner_id)
+        if summary:
+            query = query.with_entities(*_LIST_SUMMARY_COLUMNS)
         
         if is_archived is not None:
             query = query.filter(List.is_archived == is_archived)
         
-        total = query.count()
-        lists = query.order_by(desc(List.created_at)).offset(skip).limit(limit).all()
+        total = self.count_by_owner(owner_id, is_archived) if include_total else None
         
-        return lists, total
+        query = query.order_by(desc(List.created_at), desc(List.id))
+        if cursor is not None:
+            query = query.filter(tuple_(List.created_at, List.id) < tuple_(*cursor))
+        else:
+            query = query.offset(skip)
+        lists = query.limit(limit + 1).all()
+        
+        return lists[:limit], total, len(lists) > limit
     
-    def update(self, list_id: int, **kwargs) -> Optional[List]:
-        """Update list information"""
-        db_list = self.get_by_id(list_id)
-        if not db_list:
-            return None
+    def count_by_owner(self, owner_id: int, is_archived: Optional[bool] = None) -> int:
+        """Count lists for a specific owner"""
+        key = (owner_id, is_archived)
+        with _TOTAL_CACHE_LOCK:
+            total = _TOTAL_CACHE.get(key)
+        if total is not None:
+            return total
+        
+        stmt = select(func.count()).select_from(List).where(List.owner_id == owner_id)
+        if is_archived is not None:
+            stmt = stmt.where(List.is_archived == is_archived)
+        total = self.db.execute(stmt).scalar_one()
         
-        allowed_fields = {'title', 'description', 'is_archived'}
-        for key, value in kwargs.items():
-            if key in allowed_fields and value is not None:
-                setattr(db_list, key, value)
+        with _TOTAL_CACHE_LOCK:
+            _TOTAL_CACHE[key] = total
+        return total
+    
+    def update(self, list_id: int, **kwargs) -> Optional[List]:
+        """Update list information in a single UPDATE ... RETURNING"""
+        values = {
+            key: value for key, value in kwargs.items()
+            if key in _LIST_UPDATE_FIELDS and value is not None
+        }
+        if not values:
+            return self.get_by_id(list_id)
         
+        db_list = self.db.execute(
+            update(List).where(List.id == list_id).values(**values).returning(List),
+            execution_options={"synchronize_session": False, "populate_existing": True}
+        ).scalar_one_or_none()
+        if db_list is not None:
+            # Detach so the commit does not expire the values just returned
+            self.db.expunge(db_list)
         self.db.commit()
-        self.db.refresh(db_list)
+        if db_list is not None and 'is_archived' in values:
+            _invalidate_totals(db_list.owner_id)
         return db_list
     
     def delete(self, list_id: int) -> bool:
@@ -72,8 +190,10 @@ class ListRepository:
         if not db_list:
             return False
         
+        owner_id = db_list.owner_id
         self.db.delete(db_list)
         self.db.commit()
+        _invalidate_totals(owner_id)
         return True
     
     def archive(self, list_id: int) -> Optional[List]:
@@ -103,46 +223,136 @@ class ListItemRepository:
         self.db.refresh(item)
         return item
     
+    def create_many(self, list_id: int, rows: list[dict]) -> list[ListItem]:
+        """Create list items in one INSERT, returned in the order given
+        
+        Each row holds content and optionally is_completed and order.
+        """
+        if not rows:
+            return []
+        
+        values = [
+            {
+                "list_id": list_id,
+                "content": row["content"],
+                "is_completed": row.get("is_completed", False),
+                "order": row.get("order", 0)
+            }
+            for row in rows
+        ]
+        items = self.db.scalars(
+            insert(ListItem).returning(ListItem, sort_by_parameter_order=True),
+            values
+        ).all()
+        for item in items:
+            # Detach so the commit does not expire the values just returned
+            self.db.expunge(item)
+        self.db.commit()
+        return items
+    
     def get_by_id(self, item_id: int) -> Optional[ListItem]:
         """Get list item by ID"""
-        return self.db.query(ListItem).filter(ListItem.id == item_id).first()
+        return self.db.query(ListItem).options(raiseload("*")).filter(ListItem.id == item_id).first()
     
     def get_by_list(self, list_id: int) -> list[ListItem]:
         """Get all items in a list"""
-        return self.db.query(ListItem).filter(ListItem.list_id == list_id).order_by(ListItem.order).all()
+        return self.db.query(ListItem).options(raiseload("*")).filter(
+            ListItem.list_id == list_id
+        ).order_by(ListItem.order).all()
     
-    def update(self, item_id: int, **kwargs) -> Optional[ListItem]:
-        """Update list item"""
-        item = self.get_by_id(item_id)
-        if not item:
-            return None
+    def stream_by_list(self, list_id: int, partition_size: int = 500) -> Iterator[Sequence[ListItem]]:
+        """Yield a list's items in order from a server-side cursor, in partitions"""
+        result = self.db.execute(
+            select(ListItem).options(raiseload("*")).where(
+                ListItem.list_id == list_id
+            ).order_by(ListItem.order),
+            execution_options={"yield_per": partition_size}
+        )
+        try:
+            yield from result.scalars().partitions()
+        finally:
+            result.close()
+    
+    def get_by_owned_list(self, list_id: int, owner_id: int) -> Optional[list[ListItem]]:
+        """Get all items in a list, or None if the owner has no such list
         
-        allowed_fields = {'content', 'is_completed', 'order'}
-        for key, value in kwargs.items():
-            if key in allowed_fields and value is not None:
-                setattr(item, key, value)
+        Ownership is checked in the same query by outer joining from List.
+        """
+        rows = self.db.query(List.id, ListItem).select_from(List).outerjoin(
+            ListItem, ListItem.list_id == List.id
+        ).options(raiseload("*")).filter(
+            List.id == list_id,
+            List.owner_id == owner_id
+        ).order_by(ListItem.order).all()
+        if not rows:
+            return None
+        return [item for _, item in rows if item is not None]
+    
+    def get_owned(self, item_id: int, owner_id: int, list_id: Optional[int] = None) -> Optional[ListItem]:
+        """Get list item by ID if its list belongs to the owner"""
+        query = self.db.query(ListItem).join(
+            List, List.id == ListItem.list_id
+        ).options(raiseload("*")).filter(
+            ListItem.id == item_id,
+            List.owner_id == owner_id
+        )
+        if list_id is not None:
+            query = query.filter(ListItem.list_id == list_id)
+        return query.first()
+    
+    def update(self, item_id: int, owner_id: int, list_id: Optional[int] = None, **kwargs) -> Optional[ListItem]:
+        """Update an owned list item"""
+        values = {
+            key: value for key, value in kwargs.items()
+            if key in _ITEM_UPDATE_FIELDS and value is not None
+        }
+        if not values:
+            return self.get_owned(item_id, owner_id, list_id)
         
+        stmt = update(ListItem).where(
+            ListItem.id == item_id, _owned_by(owner_id, list_id)
+        ).values(**values)
+        return self._update_returning(stmt)
+    
+    def delete(self, item_id: int, owner_id: int, list_id: Optional[int] = None) -> Optional[int]:
+        """Delete an owned list item, returning the ID of the list it was in"""
+        stmt = delete(ListItem).where(
+            ListItem.id == item_id, _owned_by(owner_id, list_id)
+        ).returning(ListItem.list_id)
+        list_id = self.db.execute(
+            stmt, execution_options={"synchronize_session": False}
+        ).scalar_one_or_none()
         self.db.commit()
-        self.db.refresh(item)
-        return item
+        return list_id
     
-    def delete(self, item_id: int) -> bool:
-        """Delete a list item"""
-        item = self.get_by_id(item_id)
-        if not item:
-            return False
-        
-        self.db.delete(item)
+    def toggle_completion(self, item_id: int, owner_id: int, list_id: Optional[int] = None) -> Optional[ListItem]:
+        """Toggle completion status of an owned list item"""
+        stmt = update(ListItem).where(
+            ListItem.id == item_id, _owned_by(owner_id, list_id)
+        ).values(
+            is_completed=not_(func.coalesce(ListItem.is_completed, False))
+        )
+        return self._update_returning(stmt)
+    
+    def set_completion(self, list_id: int, owner_id: int, item_ids: list[int], is_completed: bool) -> list[int]:
+        """Set completion on many items of an owned list, returning the IDs updated"""
+        stmt = update(ListItem).where(
+            ListItem.id.in_(item_ids), _owned_by(owner_id, list_id)
+        ).values(is_completed=is_completed).returning(ListItem.id)
+        updated = self.db.execute(
+            stmt, execution_options={"synchronize_session": False}
+        ).scalars().all()
         self.db.commit()
-        return True
+        return updated
     
-    def toggle_completion(self, item_id: int) -> Optional[ListItem]:
-        """Toggle item completion status"""
-        item = self.get_by_id(item_id)
-        if not item:
-            return None
-        
-        item.is_completed = not item.is_completed
+    def _update_returning(self, stmt) -> Optional[ListItem]:
+        """Run an UPDATE in one round-trip and return the updated row"""
+        item = self.db.execute(
+            stmt.returning(ListItem),
+            execution_options={"synchronize_session": False, "populate_existing": True}
+        ).scalar_one_or_none()
+        if item is not None:
+            # Detach so the commit does not expire the values just returned
+            self.db.expunge(item)
         self.db.commit()
-        self.db.refresh(item)
         return item
@@ -1,7 +1,16 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import delete, desc, literal, select, tuple_, update
+from sqlalchemy.sql import func
 from app.models.user import User
-from typing import Optional
+from typing import Iterator, Optional, Sequence
+from datetime import datetime
+
+# Pages larger than this are streamed in partitions rather than fetched at once
+_STREAM_THRESHOLD = 50
+_STREAM_PARTITION_SIZE = 50
+
+# Columns a caller may change through update()
+_ALLOWED_UPDATE_FIELDS = frozenset({'email', 'full_name', 'is_active'})
 
 
 class UserRepository:
@@ -30,49 +39,194 @@ class UserRepository:
         self.db.refresh(db_user)
         return db_user
     
+    def create_if_absent(
+        self,
+        email: str,
+        full_name: str,
+        is_active: bool = True,
+        is_superuser: bool = False
+    ) -> Optional[User]:
+        """Create a new user unless the email is taken, in one INSERT
+        
+        Returns None when a user with this email already exists.
+        """
+        row = {
+            "email": email,
+            "full_name": full_name,
+            "is_active": is_active,
+            "is_superuser": is_superuser
+        }
+        users = self.create_many_if_absent([row])
+        return users[0] if users else None
+    
+    def create_many_if_absent(self, rows: list[dict]) -> list[User]:
+        """Create users in one multi-row INSERT, skipping taken emails
+        
+        Each row holds email, full_name and optionally is_active and
+        is_superuser. Returns the users that were created, in no particular
+        order; rows whose email already exists are left out.
+        """
+        if not rows:
+            return []
+        
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            created = {}
+            for row in rows:
+                if row["email"] not in created and not self.exists_by_email(row["email"]):
+                    created[row["email"]] = self.create(**row)
+            return list(created.values())
+        
+        values = [
+            {
+                "email": row["email"],
+                "full_name": row["full_name"],
+                "hashed_password": "AUTH_DISABLED",
+                "is_active": row.get("is_active", True),
+                "is_superuser": row.get("is_superuser", False)
+            }
+            for row in rows
+        ]
+        stmt = insert(User).values(values).on_conflict_do_nothing(
+            index_elements=["email"]
+        ).returning(User)
+        users = self.db.execute(
+            stmt, execution_options={"populate_existing": True}
+        ).scalars().all()
+        for user in users:
+            # Detach so the commit does not expire the values just returned
+            self.db.expunge(user)
+        self.db.commit()
+        return users
+    
     def get_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
-        return self.db.query(User).filter(User.id == user_id).first()
+        # Served from the identity map without SQL when already loaded
+        return self.db.get(User, user_id)
+    
+    def get_many(self, user_ids: list[int]) -> list[User]:
+        """Get the users with the given IDs in one query"""
+        return self.db.query(User).options(defer(User.hashed_password)).filter(
+            User.id.in_(user_ids)
+        ).all()
     
     def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         return self.db.query(User).filter(User.email == email).first()
     
-    def get_all(self, skip: int = 0, limit: int = 20, is_active: Optional[bool] = None) -> tuple[list[User], int]:
-        """Get all users with pagination"""
-        query = self.db.query(User)
+    def exists_by_email(self, email: str) -> bool:
+        """Check whether a user with this email exists without loading it"""
+        stmt = select(literal(1)).where(User.email == email).limit(1)
+        return self.db.execute(stmt).first() is not None
+    
+    def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        is_active: Optional[bool] = None,
+        include_total: bool = False
+    ) -> tuple[Iterator[Sequence[User]], Optional[int]]:
+        """Get all users with pagination
+        
+        Returns the page rows in partitions (see _partitions) and the total,
+        which is only counted when include_total is set.
+        """
+        # Listings never expose the password hash, so leave it in the database
+        query = self.db.query(User).options(defer(User.hashed_password))
         
         if is_active is not None:
             query = query.filter(User.is_active == is_active)
         
-        total = query.count()
-        users = query.order_by(desc(User.created_at)).offset(skip).limit(limit).all()
+        total = self.count(is_active) if include_total else None
+        query = query.order_by(desc(User.created_at), desc(User.id)).offset(skip)
         
-        return users, total
+        return self._partitions(query, limit), total
+    
+    def get_page(
+        self,
+        cursor: Optional[tuple[datetime, int]],
+        limit: int = 20,
+        is_active: Optional[bool] = None
+    ) -> Iterator[Sequence[User]]:
+        """Get users newest first, seeking past a (created_at, id) cursor"""
+        # Listings never expose the password hash, so leave it in the database
+        query = self.db.query(User).options(defer(User.hashed_password))
+        
+        if is_active is not None:
+            query = query.filter(User.is_active == is_active)
+        
+        if cursor is not None:
+            query = query.filter(tuple_(User.created_at, User.id) < tuple_(*cursor))
+        
+        return self._partitions(query.order_by(desc(User.created_at), desc(User.id)), limit)
+    
+    def _partitions(self, query, limit: int) -> Iterator[Sequence[User]]:
+        """Fetch up to limit + 1 rows, the extra one signalling another page
+        
+        Large pages are streamed from a server-side cursor in chunks so only
+        one chunk of User instances is alive at a time.
+        """
+        query = query.limit(limit + 1)
+        if limit <= _STREAM_THRESHOLD:
+            yield query.all()
+            return
+        
+        result = self.db.execute(
+            query.statement,
+            execution_options={"yield_per": _STREAM_PARTITION_SIZE}
+        )
+        try:
+            yield from result.scalars().partitions()
+        finally:
+            result.close()
+    
+    def count(self, is_active: Optional[bool] = None) -> int:
+        """Count users"""
+        stmt = select(func.count()).select_from(User)
+        if is_active is not None:
+            stmt = stmt.where(User.is_active == is_active)
+        return self.db.execute(stmt).scalar_one()
     
     def update(self, user_id: int, **kwargs) -> Optional[User]:
-        """Update user information"""
-        user = self.get_by_id(user_id)
-        if not user:
-            return None
-
+        """Update user information in a single UPDATE ... RETURNING"""
         # Update only allowed fields
-        allowed_fields = {'email', 'full_name', 'is_active'}
-        for key, value in kwargs.items():
-            if key in allowed_fields and value is not None:
-                setattr(user, key, value)
+        data = {
+            key: value for key, value in kwargs.items()
+            if key in _ALLOWED_UPDATE_FIELDS and value is not None
+        }
+        if not data:
+            return self.get_by_id(user_id)
         
+        stmt = update(User).where(User.id == user_id).values(**data).returning(User)
+        user = self.db.execute(
+            stmt,
+            execution_options={"synchronize_session": False, "populate_existing": True}
+        ).scalar_one_or_none()
+        if user is not None:
+            # Detach so the commit does not expire the values just returned
+            self.db.expunge(user)
         self.db.commit()
-        self.db.refresh(user)
         return user
     
     def delete(self, user_id: int) -> bool:
-        """Delete a user"""
-        user = self.get_by_id(user_id)
-        if not user:
-            return False
-        
-        self.db.delete(user)
+        """Delete a user, returning whether a row was removed"""
+        result = self.db.execute(
+            delete(User).where(User.id == user_id).returning(User.id),
+            execution_options={"synchronize_session": False}
+        )
+        deleted = result.first() is not None
+        self.db.commit()
+        return deleted
+    
+    def update_last_login(self, user_id: int) -> None:
+        """Update user last login timestamp"""
+        self.db.query(User).filter(User.id == user_id).update(
+            {User.last_login: func.now()},
+            synchronize_session=False
+        )
         self.db.commit()
-        return True
     
@@ -0,0 +1,55 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Literal, Optional, List as PyList
+
+from app.utils.helpers import schema_example
+
+# OpenAPI examples, attached to the schemas only when DEBUG is on
+_EXAMPLES = {
+    "BatchRequest": {
+        "calls": [
+            {
+                "call_id": 0,
+                "method": "POST",
+                "path": "/api/v1/users/",
+                "payload": {"email": "user@example.com", "full_name": "John Doe"}
+            },
+            {
+                "call_id": 1,
+                "method": "GET",
+                "path": "/api/v1/users/{{$0.id}}",
+                "input_from": 0
+            }
+        ]
+    }
+}
+
+
+class BatchCall(BaseModel):
+    """One API call inside a batch"""
+    call_id: int = Field(..., ge=0, description="Caller-chosen ID, unique within the batch")
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = Field(..., description="HTTP method")
+    path: str = Field(..., min_length=1, description="API path, may contain {{$<call_id>.<field>}} tokens")
+    payload: Optional[Any] = Field(None, description="JSON body, may contain {{$<call_id>.<field>}} tokens")
+    input_from: Optional[int] = Field(None, description="Call whose result this call depends on")
+
+
+class BatchRequest(BaseModel):
+    """Schema for a batch of API calls"""
+    calls: PyList[BatchCall] = Field(..., min_length=1, max_length=20, description="Calls to run (at most 20)")
+
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["BatchRequest"])
+    )
+
+
+class BatchResult(BaseModel):
+    """Outcome of one call, at the same index as the request"""
+    call_id: int = Field(..., description="ID of the call")
+    status: int = Field(..., description="HTTP status of the call")
+    body: Optional[Any] = Field(None, description="Decoded JSON response body")
+    error: Optional[str] = Field(None, description="Why the call was not run")
+
+
+class BatchResponse(BaseModel):
+    """Schema for batch response"""
+    results: PyList[BatchResult] = Field(..., description="One result per call, in request order")
@@ -1,7 +1,66 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List as PyList
 from datetime import datetime
 
+from app.utils.helpers import schema_example
+
+# OpenAPI examples, attached to the schemas only when DEBUG is on
+_EXAMPLES = {
+    "ListItemCreateRequest": {
+        "content": "Buy groceries",
+        "is_completed": False,
+        "order": 0
+    },
+    "ListItemBulkCreateRequest": {
+        "items": [
+            {"content": "Buy groceries", "is_completed": False, "order": 0},
+            {"content": "Pay rent", "is_completed": False, "order": 1}
+        ]
+    },
+    "ListItemBulkCompletionRequest": {
+        "item_ids": [1, 2, 3],
+        "is_completed": True
+    },
+    "ListItemUpdateRequest": {
+        "is_completed": True
+    },
+    "ListItemResponse": {
+        "id": 1,
+        "list_id": 1,
+        "content": "Buy groceries",
+        "is_completed": False,
+        "order": 0,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z"
+    },
+    "ListCreateRequest": {
+        "title": "Shopping",
+        "description": "Weekly shopping list",
+        "is_archived": False
+    },
+    "ListUpdateRequest": {
+        "title": "Updated Shopping",
+        "is_archived": False
+    },
+    "ListResponse": {
+        "id": 1,
+        "owner_id": 1,
+        "title": "Shopping",
+        "description": "Weekly shopping list",
+        "is_archived": False,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z"
+    },
+    "ListsListResponse": {
+        "total": None,
+        "skip": 0,
+        "limit": 20,
+        "has_more": False,
+        "next_cursor": None,
+        "items": []
+    }
+}
+
 
 class ListItemBase(BaseModel):
     """Base list item schema"""
@@ -13,14 +72,20 @@ class ListItemBase(BaseModel):
 class ListItemCreateRequest(ListItemBase):
     """Schema for creating a list item"""
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "content": "Buy groceries",
-                "is_completed": False,
-                "order": 0
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["ListItemCreateRequest"])
+    )
+
+
+class ListItemBulkCreateRequest(BaseModel):
+    """Schema for adding many items to a list in one request"""
+    items: PyList[ListItemCreateRequest] = Field(
+        ..., min_length=1, max_length=100, description="Items to add (at most 100)"
+    )
+    
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["ListItemBulkCreateRequest"])
+    )
 
 
 class ListItemUpdateRequest(BaseModel):
@@ -29,12 +94,25 @@ class ListItemUpdateRequest(BaseModel):
     is_completed: Optional[bool] = Field(None, description="Whether item is completed")
     order: Optional[int] = Field(None, ge=0, description="Item order in the list")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "is_completed": True
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["ListItemUpdateRequest"])
+    )
+
+
+class ListItemBulkCompletionRequest(BaseModel):
+    """Schema for setting completion on many items of a list"""
+    item_ids: PyList[int] = Field(..., min_length=1, max_length=100, description="Items to update (at most 100)")
+    is_completed: bool = Field(..., description="Completion status to set")
+    
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["ListItemBulkCompletionRequest"])
+    )
+
+
+class ListItemBulkCompletionResponse(BaseModel):
+    """Schema for bulk completion response"""
+    updated: int = Field(..., description="Number of items updated")
+    not_found: PyList[int] = Field(..., description="Requested item IDs that are not in the list")
 
 
 class ListItemResponse(ListItemBase):
@@ -44,19 +122,11 @@ class ListItemResponse(ListItemBase):
     created_at: datetime = Field(..., description="Item creation timestamp")
     updated_at: datetime = Field(..., description="Item last update timestamp")
     
-    class Config:
-        from_attributes = True
-        json_schema_extra = {
-            "example": {
-                "id": 1,
-                "list_id": 1,
-                "content": "Buy groceries",
-                "is_completed": False,
-                "order": 0,
-                "created_at": "2024-01-01T00:00:00Z",
-                "updated_at": "2024-01-01T00:00:00Z"
-            }
-        }
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        json_schema_extra=schema_example(_EXAMPLES["ListItemResponse"])
+    )
 
 
 class ListBase(BaseModel):
@@ -69,14 +139,9 @@ class ListBase(BaseModel):
 class ListCreateRequest(ListBase):
     """Schema for creating a new list"""
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "title": "Shopping",
-                "description": "Weekly shopping list",
-                "is_archived": False
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["ListCreateRequest"])
+    )
 
 
 class ListUpdateRequest(BaseModel):
@@ -85,13 +150,9 @@ class ListUpdateRequest(BaseModel):
     description: Optional[str] = Field(None, max_length=2000, description="List description")
     is_archived: Optional[bool] = Field(None, description="Whether list is archived")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "title": "Updated Shopping",
-                "is_archived": False
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["ListUpdateRequest"])
+    )
 
 
 class ListResponse(ListBase):
@@ -101,42 +162,32 @@ class ListResponse(ListBase):
     created_at: datetime = Field(..., description="List creation timestamp")
     updated_at: datetime = Field(..., description="List last update timestamp")
     
-    class Config:
-        from_attributes = True
-        json_schema_extra = {
-            "example": {
-                "id": 1,
-                "owner_id": 1,
-                "title": "Shopping",
-                "description": "Weekly shopping list",
-                "is_archived": False,
-                "created_at": "2024-01-01T00:00:00Z",
-                "updated_at": "2024-01-01T00:00:00Z"
-            }
-        }
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        json_schema_extra=schema_example(_EXAMPLES["ListResponse"])
+    )
 
 
 class ListDetailResponse(ListResponse):
     """Schema for list response with items"""
     items: PyList[ListItemResponse] = Field(default_factory=list, description="List items")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True
+    )
 
 
 class ListsListResponse(BaseModel):
     """Schema for paginated lists response"""
-    total: int = Field(..., description="Total number of lists")
+    total: Optional[int] = Field(None, description="Total number of lists (only when include_total is requested)")
     skip: int = Field(..., description="Number of items skipped")
     limit: int = Field(..., description="Number of items returned")
+    has_more: bool = Field(..., description="Whether more lists follow this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for fetching the next page")
     items: PyList[ListResponse] = Field(..., description="List of lists")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "total": 10,
-                "skip": 0,
-                "limit": 20,
-                "items": []
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["ListsListResponse"])
+    )
@@ -1,7 +1,46 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional, List as PyList
 from datetime import datetime
 
+from app.utils.helpers import schema_example
+
+# OpenAPI examples, attached to the schemas only when DEBUG is on
+_EXAMPLES = {
+    "UserCreateRequest": {
+        "email": "user@example.com",
+        "full_name": "John Doe",
+        "is_active": True
+    },
+    "UserBulkCreateRequest": {
+        "users": [
+            {"email": "alice@example.com", "full_name": "Alice Doe", "is_active": True},
+            {"email": "bob@example.com", "full_name": "Bob Doe", "is_active": True}
+        ]
+    },
+    "UserUpdateRequest": {
+        "email": "newemail@example.com",
+        "full_name": "Jane Doe"
+    },
+    "UserResponse": {
+        "id": 1,
+        "email": "user@example.com",
+        "full_name": "John Doe",
+        "is_active": True,
+        "is_superuser": False,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+        "last_login": None
+    },
+    "UsersListResponse": {
+        "total": None,
+        "skip": 0,
+        "limit": 20,
+        "has_more": False,
+        "next_cursor": None,
+        "items": []
+    }
+}
+
 
 class UserBase(BaseModel):
     """Base user schema with common fields"""
@@ -12,14 +51,20 @@ class UserBase(BaseModel):
 
 class UserCreateRequest(UserBase):
     """Schema for creating a new user"""
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "email": "user@example.com",
-                "full_name": "John Doe",
-                "is_active": True
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["UserCreateRequest"])
+    )
+
+
+class UserBulkCreateRequest(BaseModel):
+    """Schema for creating many users in one request"""
+    users: PyList[UserCreateRequest] = Field(
+        ..., min_length=1, max_length=100, description="Users to create (at most 100)"
+    )
+    
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["UserBulkCreateRequest"])
+    )
 
 
 class UserUpdateRequest(BaseModel):
@@ -28,13 +73,9 @@ class UserUpdateRequest(BaseModel):
     full_name: Optional[str] = Field(None, min_length=1, max_length=255, description="User full name")
     is_active: Optional[bool] = Field(None, description="Whether user account is active")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "email": "newemail@example.com",
-                "full_name": "Jane Doe"
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["UserUpdateRequest"])
+    )
 
 
 class UserResponse(UserBase):
@@ -45,41 +86,42 @@ class UserResponse(UserBase):
     updated_at: datetime = Field(..., description="User last update timestamp")
     last_login: Optional[datetime] = Field(None, description="User last login timestamp")
     
-    class Config:
-        from_attributes = True
-        json_schema_extra = {
-            "example": {
-                "id": 1,
-                "email": "user@example.com",
-                "full_name": "John Doe",
-                "is_active": True,
-                "is_superuser": False,
-                "created_at": "2024-01-01T00:00:00Z",
-                "updated_at": "2024-01-01T00:00:00Z",
-                "last_login": None
-            }
-        }
+    model_config = ConfigDict(
+        from_attributes=True,
+        frozen=True,
+        json_schema_extra=schema_example(_EXAMPLES["UserResponse"])
+    )
+
+
+class UserBulkResult(BaseModel):
+    """Outcome for one entry of a bulk create, at the same index as the request"""
+    index: int = Field(..., description="Position of the entry in the request")
+    user: Optional[UserResponse] = Field(None, description="Created user, if the entry succeeded")
+    error: Optional[str] = Field(None, description="Why the entry was not created")
+
+
+class UserBulkCreateResponse(BaseModel):
+    """Schema for bulk user creation response"""
+    created: int = Field(..., description="Number of users created")
+    results: PyList[UserBulkResult] = Field(..., description="One result per requested user, in request order")
 
 
 class PaginationParams(BaseModel):
     """Schema for pagination parameters"""
     skip: int = Field(0, ge=0, description="Number of items to skip")
     limit: int = Field(20, ge=1, le=100, description="Number of items to return")
+    cursor: Optional[str] = Field(None, description="Opaque cursor from a previous page's next_cursor")
 
 
 class UsersListResponse(BaseModel):
     """Schema for paginated users list response"""
-    total: int = Field(..., description="Total number of users")
+    total: Optional[int] = Field(None, description="Total number of users (only when include_total is requested)")
     skip: int = Field(..., description="Number of items skipped")
     limit: int = Field(..., description="Number of items returned")
+    has_more: bool = Field(..., description="Whether more users follow this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for fetching the next page")
     items: PyList[UserResponse] = Field(..., description="List of users")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "total": 100,
-                "skip": 0,
-                "limit": 20,
-                "items": []
-            }
-        }
+    model_config = ConfigDict(
+        json_schema_extra=schema_example(_EXAMPLES["UsersListResponse"])
+    )
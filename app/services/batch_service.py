@@ -0,0 +1,245 @@
+"""Batch execution of API calls
+
+A batch is a small DAG: each call may depend on earlier results, either via
+``input_from`` or by referencing them with ``{{$<call_id>.<field>}}`` tokens
+in its path or payload. Calls are grouped into dependency layers; each layer
+runs concurrently and dispatches straight into the ASGI app in-process, so
+sub-calls go through the same routing, validation and middleware as normal
+requests without any network hop.
+"""
+
+import asyncio
+import logging
+import re
+from typing import Any
+
+import orjson
+from fastapi import HTTPException, status
+from starlette.types import ASGIApp, Scope
+
+from app.core.config import settings
+from app.schemas.v1.batch import BatchCall
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\{\{\$(\d+)((?:\.[A-Za-z0-9_]+)*)\}\}")
+
+# Parent request headers passed on to every sub-call
+_FORWARDED_HEADERS = frozenset({b"authorization", b"x-forwarded-for", b"user-agent"})
+
+# Connection-level scope keys a sub-call inherits from the batch request
+_INHERITED_SCOPE_KEYS = ("type", "asgi", "http_version", "scheme", "server", "client", "root_path")
+
+
+class _UnresolvedToken(Exception):
+    pass
+
+
+def _dispatchable(path: str) -> bool:
+    """Whether a sub-call path targets the API and not the batch endpoint"""
+    path = path.partition("?")[0]
+    return path.startswith(f"{settings.API_V1_STR}/") and not path.startswith(
+        f"{settings.API_V1_STR}/batch"
+    )
+
+
+def _references(value: Any) -> set[int]:
+    """Call IDs referenced by tokens anywhere in a path or payload"""
+    if isinstance(value, str):
+        return {int(match.group(1)) for match in _TOKEN.finditer(value)}
+    if isinstance(value, dict):
+        return set().union(*(_references(v) for v in value.values()))
+    if isinstance(value, list):
+        return set().union(*(_references(v) for v in value))
+    return set()
+
+
+def _lookup(results: dict[int, Any], call_id: int, fields: str) -> Any:
+    value = results.get(call_id)
+    for field in filter(None, fields.split(".")):
+        if isinstance(value, dict) and field in value:
+            value = value[field]
+        elif isinstance(value, list) and field.isdigit() and int(field) < len(value):
+            value = value[int(field)]
+        else:
+            raise _UnresolvedToken(f"${call_id}{fields}")
+    return value
+
+
+def _substitute(value: Any, results: dict[int, Any]) -> Any:
+    """Replace tokens with values from earlier results
+
+    A string that is exactly one token takes the referenced value as-is
+    (keeping ints as ints); tokens inside longer strings are interpolated.
+    """
+    if isinstance(value, str):
+        match = _TOKEN.fullmatch(value)
+        if match:
+            return _lookup(results, int(match.group(1)), match.group(2))
+        return _TOKEN.sub(
+            lambda m: str(_lookup(results, int(m.group(1)), m.group(2))), value
+        )
+    if isinstance(value, dict):
+        return {key: _substitute(v, results) for key, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, results) for v in value]
+    return value
+
+
+def plan_layers(calls: list[BatchCall]) -> tuple[list[list[BatchCall]], dict[int, set[int]]]:
+    """Group calls into layers whose dependencies all sit in earlier layers
+
+    Raises 422 for duplicate IDs, unknown references, cycles or paths
+    outside the API.
+    """
+    by_id = {call.call_id: call for call in calls}
+    if len(by_id) != len(calls):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="call_id values must be unique"
+        )
+    
+    deps: dict[int, set[int]] = {}
+    for call in calls:
+        if not _dispatchable(call.path):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Call {call.call_id}: path must be an API path other than the batch endpoint"
+            )
+        refs = _references(call.path) | _references(call.payload)
+        if call.input_from is not None:
+            refs.add(call.input_from)
+        unknown = refs - by_id.keys()
+        if unknown or call.call_id in refs:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Call {call.call_id}: invalid dependency"
+            )
+        deps[call.call_id] = refs
+    
+    layers = []
+    done: set[int] = set()
+    pending = list(calls)
+    while pending:
+        layer = [call for call in pending if deps[call.call_id] <= done]
+        if not layer:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Batch calls form a dependency cycle"
+            )
+        layers.append(layer)
+        done.update(call.call_id for call in layer)
+        pending = [call for call in pending if call.call_id not in done]
+    return layers, deps
+
+
+class BatchService:
+    """Run a batch of API calls against the application in-process"""
+    
+    def __init__(self, app: ASGIApp, scope: Scope):
+        self.app = app
+        self.scope = scope
+    
+    async def run(self, calls: list[BatchCall]) -> list[dict]:
+        """Execute the batch layer by layer, returning results in request order"""
+        layers, deps = plan_layers(calls)
+        bodies: dict[int, Any] = {}
+        outcomes: dict[int, dict] = {}
+        
+        for layer in layers:
+            results = await asyncio.gather(
+                *(self._run_call(call, deps[call.call_id], bodies, outcomes) for call in layer)
+            )
+            for call, result in zip(layer, results):
+                outcomes[call.call_id] = result
+                bodies[call.call_id] = result["body"]
+        
+        return [outcomes[call.call_id] for call in calls]
+    
+    async def _run_call(
+        self,
+        call: BatchCall,
+        deps: set[int],
+        bodies: dict[int, Any],
+        outcomes: dict[int, dict]
+    ) -> dict:
+        failed = sorted(dep for dep in deps if outcomes[dep]["status"] >= 400)
+        if failed:
+            return _invalid(call, f"depends on failed call {failed[0]}")
+        try:
+            path = _substitute(call.path, bodies)
+            payload = _substitute(call.payload, bodies)
+        except _UnresolvedToken as exc:
+            return _invalid(call, f"cannot resolve {exc}")
+        # Substituted values can rewrite the path, so it is checked again
+        if not isinstance(path, str) or not _dispatchable(path):
+            return _invalid(call, "path must be an API path other than the batch endpoint")
+        
+        status_code, body = await self._dispatch(call.method, path, payload)
+        return {"call_id": call.call_id, "status": status_code, "body": body, "error": None}
+    
+    async def _dispatch(self, method: str, path: str, payload: Any) -> tuple[int, Any]:
+        """Send one request through the ASGI app and collect its response"""
+        path, _, query = path.partition("?")
+        content = b"" if payload is None else orjson.dumps(payload)
+        headers = [(k, v) for k, v in self.scope["headers"] if k in _FORWARDED_HEADERS]
+        if content:
+            headers += [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(content)).encode("ascii")),
+            ]
+        
+        client_ip = self.scope.get("state", {}).get("client_ip")
+        scope = {key: self.scope[key] for key in _INHERITED_SCOPE_KEYS if key in self.scope}
+        scope.update({
+            "method": method,
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "query_string": query.encode("utf-8"),
+            "headers": headers,
+            # Fresh state: a sub-call must authorise with its own headers, not
+            # with anything the parent request stashed
+            "state": {"client_ip": client_ip} if client_ip else {},
+        })
+        
+        request_sent = False
+        
+        async def receive() -> dict:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": content, "more_body": False}
+            return {"type": "http.disconnect"}
+        
+        status_code = 500
+        chunks: list[bytes] = []
+        
+        async def send(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+        
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            # Earlier calls may already be committed, so one failure must not
+            # discard the results of the rest of the batch
+            logger.exception("Batch sub-call %s %s failed", method, path)
+            return status.HTTP_500_INTERNAL_SERVER_ERROR, {"detail": "Internal server error"}
+        raw = b"".join(chunks)
+        try:
+            body = orjson.loads(raw) if raw else None
+        except orjson.JSONDecodeError:
+            body = raw.decode("utf-8", errors="replace")
+        return status_code, body
+
+
+def _invalid(call: BatchCall, reason: str) -> dict:
+    return {
+        "call_id": call.call_id,
+        "status": status.HTTP_400_BAD_REQUEST,
+        "body": None,
+        "error": f"INVALID_ARGUMENT: {reason}"
+    }
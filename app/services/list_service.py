@@ -1,11 +1,108 @@
 from sqlalchemy.orm import Session
+from app.core.cache import cache_get, cache_set
+from app.db.session import SessionLocal
 from app.repositories.list_repository import ListRepository, ListItemRepository
 from app.schemas.v1.list import (
     ListCreateRequest, ListUpdateRequest, ListResponse, ListDetailResponse,
-    ListItemCreateRequest, ListItemUpdateRequest, ListItemResponse
+    ListItemBulkCompletionRequest, ListItemBulkCreateRequest, ListItemCreateRequest,
+    ListItemUpdateRequest, ListItemResponse
 )
+from app.utils.helpers import encode_cursor, decode_cursor
 from fastapi import HTTPException, status
-from typing import Optional
+from pydantic import BaseModel, TypeAdapter
+from functools import cached_property
+from typing import Any, Iterator, Optional
+import threading
+import time
+
+from cachetools import TTLCache
+
+# Trusted ORM rows are built with model_construct; the adapter dumps whole
+# pages in one pydantic-core call and validates the JSON rows from get_detail,
+# whose timestamps arrive as strings.
+_ITEMS_ADAPTER = TypeAdapter(list[ListItemResponse])
+
+# Short-lived per-process caches for list reads keyed by list ID; any write
+# through these services evicts the affected list. Entries are (read_at, value)
+# and item values are (owner_id, items). Writes on other workers are seen
+# through a per-list write timestamp in Redis, when configured.
+_LIST_DETAIL_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_LIST_ITEMS_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_LIST_CACHE_LOCK = threading.Lock()
+
+
+def _row_values(model: type[BaseModel], obj) -> dict:
+    """Read a response model's fields off a trusted ORM row
+    
+    Paired with model_construct to skip validation for rows read back from
+    the database, whose column types already match the schema. Request
+    payloads must keep going through normal validation. Fields a row does
+    not carry (description on summary rows) are left to their defaults.
+    """
+    return {name: getattr(obj, name) for name in model.model_fields if hasattr(obj, name)}
+
+
+def _construct_many(model: type[BaseModel], rows) -> list:
+    return [model.model_construct(**_row_values(model, row)) for row in rows]
+
+
+def _stream_items(list_id: int) -> Iterator[bytes]:
+    """Encode a list's items as a JSON array one partition at a time
+    
+    Runs on its own session, opened on the first chunk and closed after the
+    last one (or when the generator is closed): the request session cannot be
+    relied on once the handler has returned. Each partition is released
+    before the next is fetched.
+    """
+    db = SessionLocal()
+    try:
+        yield b"["
+        first = True
+        for partition in ListItemRepository(db).stream_by_list(list_id):
+            if not partition:
+                continue
+            chunk = _ITEMS_ADAPTER.dump_json(_construct_many(ListItemResponse, partition))[1:-1]
+            yield chunk if first else b"," + chunk
+            first = False
+            db.expunge_all()
+        yield b"]"
+    finally:
+        db.close()
+
+
+def _list_written_key(list_id: int) -> str:
+    return f"list:{list_id}:written"
+
+
+def _get_cached(cache: TTLCache, list_id: int) -> Optional[Any]:
+    """Get a cached list read unless the list was written since it was read"""
+    with _LIST_CACHE_LOCK:
+        entry = cache.get(list_id)
+    if entry is None:
+        return None
+    read_at, value = entry
+    written = cache_get(_list_written_key(list_id))
+    if written is not None and float(written) >= read_at:
+        with _LIST_CACHE_LOCK:
+            cache.pop(list_id, None)
+        return None
+    return value
+
+
+def _set_cached(cache: TTLCache, list_id: int, read_at: float, value: Any) -> None:
+    with _LIST_CACHE_LOCK:
+        cache[list_id] = (read_at, value)
+
+
+def _evict_list(list_id: int) -> None:
+    with _LIST_CACHE_LOCK:
+        _LIST_DETAIL_CACHE.pop(list_id, None)
+        _LIST_ITEMS_CACHE.pop(list_id, None)
+    cache_set(
+        _list_written_key(list_id),
+        repr(time.time()).encode("ascii"),
+        int(_LIST_DETAIL_CACHE.ttl) + 1
+    )
 
 
 class ListService:
@@ -13,8 +110,14 @@ class ListService:
     
     def __init__(self, db: Session):
         self.db = db
-        self.repository = ListRepository(db)
-        self.item_repository = ListItemRepository(db)
+    
+    @cached_property
+    def repository(self) -> ListRepository:
+        return ListRepository(self.db)
+    
+    @cached_property
+    def item_repository(self) -> ListItemRepository:
+        return ListItemRepository(self.db)
     
     def create_list(self, owner_id: int, list_data: ListCreateRequest) -> ListResponse:
         """Create a new list"""
@@ -27,28 +130,78 @@ class ListService:
     
     def get_list(self, list_id: int, owner_id: Optional[int] = None) -> ListDetailResponse:
         """Get list with its items"""
+        cached = _get_cached(_LIST_DETAIL_CACHE, list_id)
+        # Entries are shared across callers, so ownership is re-checked on hit
+        if cached is not None and (not owner_id or cached.owner_id == owner_id):
+            return cached
+        
+        read_at = time.time()
         if owner_id:
-            db_list = self.repository.get_by_id_and_owner(list_id, owner_id)
+            detail = self.repository.get_detail(list_id, owner_id)
         else:
-            db_list = self.repository.get_by_id(list_id)
+            db_list = self.repository.get_by_id_with_items(list_id)
+            detail = (db_list, db_list.items) if db_list else None
         
-        if not db_list:
+        if not detail:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="List not found"
             )
         
-        return ListDetailResponse.from_orm(db_list)
+        db_list, items = detail
+        response = ListDetailResponse.model_construct(
+            **_row_values(ListResponse, db_list),
+            items=_ITEMS_ADAPTER.validate_python(items, from_attributes=True)
+        )
+        _set_cached(_LIST_DETAIL_CACHE, list_id, read_at, response)
+        return response
     
-    def get_user_lists(self, owner_id: int, skip: int = 0, limit: int = 20):
-        """Get all lists for a user"""
-        lists, total = self.repository.get_by_owner(owner_id, skip=skip, limit=limit)
+    def get_user_lists(
+        self,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        summary: bool = False,
+        is_archived: Optional[bool] = None
+    ):
+        """Get all lists for a user
+        
+        Summary pages leave out each list's description.
+        """
+        position = None
+        if cursor:
+            try:
+                position = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+        
+        lists, total, has_more = self.repository.get_by_owner(
+            owner_id,
+            skip=skip,
+            limit=limit,
+            cursor=position,
+            is_archived=is_archived,
+            include_total=include_total,
+            summary=summary
+        )
+        
+        next_cursor = None
+        if has_more:
+            last = lists[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
         
         return {
             "total": total,
-            "skip": skip,
+            "skip": 0 if position else skip,
             "limit": limit,
-            "items": [ListResponse.from_orm(lst) for lst in lists]
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+            "items": _construct_many(ListResponse, lists)
         }
     
     def update_list(self, list_id: int, owner_id: int, list_data: ListUpdateRequest) -> ListResponse:
@@ -62,6 +215,7 @@ class ListService:
         
         update_data = list_data.model_dump(exclude_unset=True)
         updated_list = self.repository.update(list_id, **update_data)
+        _evict_list(list_id)
         
         return ListResponse.from_orm(updated_list)
     
@@ -75,6 +229,7 @@ class ListService:
             )
         
         self.repository.delete(list_id)
+        _evict_list(list_id)
     
     def archive_list(self, list_id: int, owner_id: int) -> ListResponse:
         """Archive a list"""
@@ -86,6 +241,7 @@ class ListService:
             )
         
         archived_list = self.repository.archive(list_id)
+        _evict_list(list_id)
         return ListResponse.from_orm(archived_list)
     
     def unarchive_list(self, list_id: int, owner_id: int) -> ListResponse:
@@ -98,6 +254,7 @@ class ListService:
             )
         
         unarchived_list = self.repository.unarchive(list_id)
+        _evict_list(list_id)
         return ListResponse.from_orm(unarchived_list)
 
 
@@ -106,8 +263,14 @@ class ListItemService:
     
     def __init__(self, db: Session):
         self.db = db
-        self.repository = ListItemRepository(db)
-        self.list_repository = ListRepository(db)
+    
+    @cached_property
+    def repository(self) -> ListItemRepository:
+        return ListItemRepository(self.db)
+    
+    @cached_property
+    def list_repository(self) -> ListRepository:
+        return ListRepository(self.db)
     
     def create_item(self, list_id: int, owner_id: int, item_data: ListItemCreateRequest) -> ListItemResponse:
         """Create a new list item"""
@@ -124,96 +287,120 @@ class ListItemService:
             content=item_data.content,
             order=item_data.order
         )
+        _evict_list(list_id)
         return ListItemResponse.from_orm(item)
     
-    def get_item(self, item_id: int, owner_id: int) -> ListItemResponse:
+    def create_items(self, list_id: int, owner_id: int, payload: ListItemBulkCreateRequest) -> list[ListItemResponse]:
+        """Create many list items with one ownership check and one INSERT"""
+        db_list = self.list_repository.get_by_id_and_owner(list_id, owner_id)
+        if not db_list:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="List not found"
+            )
+        
+        items = self.repository.create_many(
+            list_id, [item_data.model_dump() for item_data in payload.items]
+        )
+        _evict_list(list_id)
+        return _construct_many(ListItemResponse, items)
+    
+    def set_items_completion(self, list_id: int, owner_id: int, payload: ListItemBulkCompletionRequest) -> dict:
+        """Set completion on many items with a single UPDATE"""
+        item_ids = list(dict.fromkeys(payload.item_ids))
+        updated = self.repository.set_completion(list_id, owner_id, item_ids, payload.is_completed)
+        # Nothing updated may mean the list itself is missing; only then check
+        if not updated and not self.list_repository.get_by_id_and_owner(list_id, owner_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="List not found"
+            )
+        _evict_list(list_id)
+        
+        found = set(updated)
+        return {
+            "updated": len(updated),
+            "not_found": [item_id for item_id in item_ids if item_id not in found]
+        }
+    
+    def get_item(self, item_id: int, owner_id: int, list_id: Optional[int] = None) -> ListItemResponse:
         """Get list item with ownership check"""
-        item = self.repository.get_by_id(item_id)
+        item = self.repository.get_owned(item_id, owner_id, list_id)
         if not item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Item not found"
             )
         
-        # Verify ownership through list
-        db_list = self.list_repository.get_by_id_and_owner(item.list_id, owner_id)
-        if not db_list:
+        return ListItemResponse.from_orm(item)
+    
+    def stream_list_items(self, list_id: int, owner_id: int) -> Iterator[bytes]:
+        """Stream all items in a list as JSON with ownership check
+        
+        Ownership is checked up front so a missing list is still a 404.
+        """
+        if not self.list_repository.get_by_id_and_owner(list_id, owner_id):
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="List not found"
             )
-        
-        return ListItemResponse.from_orm(item)
+        return _stream_items(list_id)
     
     def get_list_items(self, list_id: int, owner_id: int) -> list[ListItemResponse]:
         """Get all items in a list with ownership check"""
-        db_list = self.list_repository.get_by_id_and_owner(list_id, owner_id)
-        if not db_list:
+        cached = _get_cached(_LIST_ITEMS_CACHE, list_id)
+        # Entries are shared across callers, so ownership is re-checked on hit
+        if cached is not None and cached[0] == owner_id:
+            return cached[1]
+        
+        read_at = time.time()
+        items = self.repository.get_by_owned_list(list_id, owner_id)
+        if items is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="List not found"
             )
         
-        items = self.repository.get_by_list(list_id)
-        return [ListItemResponse.from_orm(item) for item in items]
+        response = _construct_many(ListItemResponse, items)
+        _set_cached(_LIST_ITEMS_CACHE, list_id, read_at, (owner_id, response))
+        return response
     
-    def update_item(self, item_id: int, owner_id: int, item_data: ListItemUpdateRequest) -> ListItemResponse:
+    def update_item(
+        self,
+        item_id: int,
+        owner_id: int,
+        item_data: ListItemUpdateRequest,
+        list_id: Optional[int] = None
+    ) -> ListItemResponse:
         """Update list item"""
-        item = self.repository.get_by_id(item_id)
-        if not item:
+        update_data = item_data.model_dump(exclude_unset=True)
+        updated_item = self.repository.update(item_id, owner_id, list_id, **update_data)
+        if not updated_item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Item not found"
             )
-        
-        # Verify ownership through list
-        db_list = self.list_repository.get_by_id_and_owner(item.list_id, owner_id)
-        if not db_list:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied"
-            )
-        
-        update_data = item_data.model_dump(exclude_unset=True)
-        updated_item = self.repository.update(item_id, **update_data)
+        _evict_list(updated_item.list_id)
         
         return ListItemResponse.from_orm(updated_item)
     
-    def delete_item(self, item_id: int, owner_id: int) -> None:
+    def delete_item(self, item_id: int, owner_id: int, list_id: Optional[int] = None) -> None:
         """Delete a list item"""
-        item = self.repository.get_by_id(item_id)
-        if not item:
+        deleted_from = self.repository.delete(item_id, owner_id, list_id)
+        if deleted_from is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Item not found"
             )
-        
-        # Verify ownership through list
-        db_list = self.list_repository.get_by_id_and_owner(item.list_id, owner_id)
-        if not db_list:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied"
-            )
-        
-        self.repository.delete(item_id)
+        _evict_list(deleted_from)
     
-    def toggle_item_completion(self, item_id: int, owner_id: int) -> ListItemResponse:
+    def toggle_item_completion(self, item_id: int, owner_id: int, list_id: Optional[int] = None) -> ListItemResponse:
         """Toggle item completion status"""
-        item = self.repository.get_by_id(item_id)
-        if not item:
+        toggled_item = self.repository.toggle_completion(item_id, owner_id, list_id)
+        if not toggled_item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Item not found"
             )
-        
-        # Verify ownership through list
-        db_list = self.list_repository.get_by_id_and_owner(item.list_id, owner_id)
-        if not db_list:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Access denied"
-            )
-        
-        toggled_item = self.repository.toggle_completion(item_id)
+        _evict_list(toggled_item.list_id)
         return ListItemResponse.from_orm(toggled_item)
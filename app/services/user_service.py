@@ -1,7 +1,156 @@
+"""User business logic
+
+Responses for rows read back from the database are built with
+``UserResponse.model_construct`` (see ``_orm_to_response``): the ORM already
+enforces the column types, so re-running EmailStr and datetime validation on
+every row of a page is wasted work. Anything derived from client input keeps
+going through ``model_validate``.
+"""
+
 from sqlalchemy.orm import Session
 from app.repositories.user_repository import UserRepository
-from app.schemas.v1.user import UserCreateRequest, UserUpdateRequest, UserResponse
+from app.schemas.v1.user import UserBulkCreateRequest, UserCreateRequest, UserUpdateRequest, UserResponse
+from app.core.cache import cache_delete, cache_get, cache_set, get_redis
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.utils.batcher import RequestBatcher
+from app.utils.helpers import encode_cursor, decode_cursor
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from functools import cached_property
+from typing import Optional
+import threading
+import time
+
+from cachetools import TTLCache
+
+# Short-lived per-process cache for GET /users/{id} holding the encoded body,
+# used only when Redis is not configured. Writes through this service evict
+# both.
+_USER_RESPONSE_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_USER_RESPONSE_CACHE_LOCK = threading.Lock()
+
+# Users resolved by get_current_user, keyed by token cache key. Column
+# snapshots are cached rather than ORM instances so nothing stays bound to the
+# session that loaded it. _AUTH_USER_TOKENS maps each user ID to its cached
+# token keys so updates and deletes can evict them. Other workers learn about
+# those writes through a per-user write timestamp in Redis, when configured.
+_AUTH_USER_CACHE: TTLCache = TTLCache(maxsize=5000, ttl=60)
+_AUTH_USER_TOKENS: TTLCache = TTLCache(maxsize=5000, ttl=60)
+_AUTH_USER_CACHE_LOCK = threading.Lock()
+
+# Dumps a whole page of constructed responses in one pydantic-core call
+_USERS_ADAPTER = TypeAdapter(list[UserResponse])
+
+
+def _orm_to_response(user) -> UserResponse:
+    """Build a UserResponse from a trusted User row without validation"""
+    return UserResponse.model_construct(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        is_active=user.is_active,
+        is_superuser=user.is_superuser,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+        last_login=user.last_login,
+    )
+
+
+def _collect_page(partitions, limit: int) -> tuple[list, Optional[object], bool]:
+    """Dump repository partitions into JSON-ready items
+    
+    Returns the items, the last user on the page and whether the repository
+    produced a row beyond the limit. Each partition is dumped as soon as it
+    arrives so its User instances can be released.
+    """
+    items: list = []
+    last = None
+    for partition in partitions:
+        room = limit - len(items)
+        if len(partition) > room:
+            partition = partition[:room]
+            if partition:
+                items.extend(_dump_users(partition))
+                last = partition[-1]
+            return items, last, True
+        items.extend(_dump_users(partition))
+        last = partition[-1] if partition else last
+    return items, last, False
+
+
+def _dump_users(users) -> list:
+    return _USERS_ADAPTER.dump_python(
+        [_orm_to_response(user) for user in users], mode="json"
+    )
+
+
+def _load_users(user_ids: list[int]) -> dict[int, UserResponse]:
+    """Batch loader for GET /users/{id}, on its own session"""
+    db = SessionLocal()
+    try:
+        users = UserRepository(db).get_many(user_ids)
+        return {user.id: _orm_to_response(user) for user in users}
+    finally:
+        db.close()
+
+
+# Coalesces concurrent GET /users/{id} lookups into one IN query when enabled
+_USER_BATCHER = RequestBatcher(
+    _load_users,
+    max_batch=settings.USER_LOOKUP_BATCH_SIZE,
+    max_wait_ms=settings.USER_LOOKUP_MAX_WAIT_MS
+)
+
+
+def _user_cache_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def _user_written_key(user_id: int) -> str:
+    return f"user:{user_id}:written"
+
+
+def get_cached_auth_user(token_key: bytes) -> Optional[dict]:
+    """Get the user snapshot cached for a token, if any"""
+    with _AUTH_USER_CACHE_LOCK:
+        entry = _AUTH_USER_CACHE.get(token_key)
+    if entry is None:
+        return None
+    cached_at, snapshot = entry
+    # A write on another worker after this snapshot was taken invalidates it
+    written = cache_get(_user_written_key(snapshot["id"]))
+    if written is not None and float(written) >= cached_at:
+        with _AUTH_USER_CACHE_LOCK:
+            _AUTH_USER_CACHE.pop(token_key, None)
+        return None
+    return snapshot
+
+
+def cache_auth_user(token_key: bytes, snapshot: dict) -> None:
+    """Cache a user snapshot for a token until the user is next written"""
+    user_id = snapshot["id"]
+    with _AUTH_USER_CACHE_LOCK:
+        _AUTH_USER_CACHE[token_key] = (time.time(), snapshot)
+        # Drop keys that already expired so the index stays small
+        keys = {key for key in _AUTH_USER_TOKENS.get(user_id, ()) if key in _AUTH_USER_CACHE}
+        keys.add(token_key)
+        _AUTH_USER_TOKENS[user_id] = keys
+
+
+def _evict_user(user_id: int) -> None:
+    with _USER_RESPONSE_CACHE_LOCK:
+        _USER_RESPONSE_CACHE.pop(user_id, None)
+    cache_delete(_user_cache_key(user_id))
+    # Deactivation and deletion must take effect on the next request
+    with _AUTH_USER_CACHE_LOCK:
+        for key in _AUTH_USER_TOKENS.pop(user_id, ()):
+            _AUTH_USER_CACHE.pop(key, None)
+    cache_set(
+        _user_written_key(user_id),
+        repr(time.time()).encode("ascii"),
+        int(_AUTH_USER_CACHE.ttl) + 1
+    )
 
 
 class UserService:
@@ -9,59 +158,137 @@ class UserService:
     
     def __init__(self, db: Session):
         self.db = db
-        self.repository = UserRepository(db)
+    
+    @cached_property
+    def repository(self) -> UserRepository:
+        return UserRepository(self.db)
     
     def create_user(self, user_data: UserCreateRequest) -> UserResponse:
         """Create a new user with validation"""
-        # Check if user already exists
-        existing_user = self.repository.get_by_email(user_data.email)
-        if existing_user:
+        # The uniqueness check happens inside the INSERT itself
+        user = self.repository.create_if_absent(
+            email=user_data.email,
+            full_name=user_data.full_name,
+            is_active=user_data.is_active
+        )
+        if user is None:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="User with this email already exists"
             )
         
-        user = self.repository.create(
-            email=user_data.email,
-            full_name=user_data.full_name,
-            is_active=user_data.is_active
+        return UserResponse.model_validate(user)
+    
+    def create_users(self, payload: UserBulkCreateRequest) -> dict:
+        """Create many users with a single INSERT
+        
+        Results line up with the request: each index holds either the created
+        user or the reason it was skipped.
+        """
+        users = self.repository.create_many_if_absent(
+            [user_data.model_dump() for user_data in payload.users]
         )
+        created = {user.email: user for user in users}
         
-        return UserResponse.model_validate(user)
+        results = []
+        for index, user_data in enumerate(payload.users):
+            # A repeated email in the payload is only created for its first entry
+            user = created.pop(user_data.email, None)
+            if user is None:
+                results.append({"index": index, "user": None, "error": "User with this email already exists"})
+            else:
+                results.append({"index": index, "user": _dump_users([user])[0], "error": None})
+        
+        return {"created": len(users), "results": results}
     
     def get_user(self, user_id: int) -> UserResponse:
         """Get user by ID"""
-        user = self.repository.get_by_id(user_id)
-        if not user:
+        return UserResponse.model_validate_json(self.get_user_json(user_id))
+    
+    def get_user_json(self, user_id: int) -> bytes:
+        """Get user by ID as an encoded JSON body
+        
+        With Redis configured it is the only cache tier, since writes on one
+        worker cannot evict another worker's local cache; otherwise the
+        per-process cache is used.
+        """
+        shared = get_redis() is not None
+        key = _user_cache_key(user_id)
+        if shared:
+            body = cache_get(key)
+        else:
+            with _USER_RESPONSE_CACHE_LOCK:
+                body = _USER_RESPONSE_CACHE.get(user_id)
+        if body is not None:
+            return body
+        
+        if settings.USER_LOOKUP_BATCHING:
+            response = _USER_BATCHER.load(user_id)
+        else:
+            user = self.repository.get_by_id(user_id)
+            response = UserResponse.model_validate(user) if user else None
+        if response is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-        return UserResponse.model_validate(user)
+        body = response.model_dump_json().encode("utf-8")
+        if shared:
+            cache_set(key, body, settings.USER_CACHE_TTL)
+        else:
+            with _USER_RESPONSE_CACHE_LOCK:
+                _USER_RESPONSE_CACHE[user_id] = body
+        return body
     
-    def get_users(self, skip: int = 0, limit: int = 20):
-        """Get paginated list of users"""
-        users, total = self.repository.get_all(skip=skip, limit=limit)
+    def get_users(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ):
+        """Get paginated list of users
+        
+        Uses keyset pagination when a cursor is supplied, offset pagination
+        otherwise. The total is only counted when include_total is set.
+        """
+        if cursor:
+            try:
+                position = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            partitions = self.repository.get_page(position, limit=limit)
+            total = self.repository.count() if include_total else None
+            skip = 0
+        else:
+            partitions, total = self.repository.get_all(
+                skip=skip, limit=limit, include_total=include_total
+            )
+        
+        items, last, has_more = _collect_page(partitions, limit)
+        
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor(last.created_at, last.id)
+        
         return {
             "total": total,
             "skip": skip,
             "limit": limit,
-            "items": [UserResponse.model_validate(user) for user in users]
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+            "items": items
         }
     
     def update_user(self, user_id: int, user_data: UserUpdateRequest) -> UserResponse:
         """Update user information"""
-        user = self.repository.get_by_id(user_id)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        # Check if new email already exists (if email is being updated)
-        if user_data.email and user_data.email != user.email:
+        # Check if new email already belongs to another user
+        if user_data.email:
             existing_user = self.repository.get_by_email(user_data.email)
-            if existing_user:
+            if existing_user and existing_user.id != user_id:
                 raise HTTPException(
                     status_code=status.HTTP_409_CONFLICT,
                     detail="User with this email already exists"
@@ -69,17 +296,22 @@ class UserService:
         
         update_data = user_data.model_dump(exclude_unset=True)
         updated_user = self.repository.update(user_id, **update_data)
+        if not updated_user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        _evict_user(user_id)
         
         return UserResponse.model_validate(updated_user)
     
     def delete_user(self, user_id: int) -> None:
         """Delete a user"""
-        user = self.repository.get_by_id(user_id)
-        if not user:
+        if not self.repository.delete(user_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        self.repository.delete(user_id)
+        _evict_user(user_id)
     
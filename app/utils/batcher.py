@@ -0,0 +1,88 @@
+"""Coalescing of concurrent point lookups into batched queries"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class RequestBatcher(Generic[K, V]):
+    """Collect keys requested within a short window and load them together
+
+    Handlers run in the threadpool, so callers block on a Future until the
+    batch holding their key is loaded. A batch is flushed when it reaches
+    max_batch keys or max_wait_ms after its first key arrived, whichever
+    comes first. Concurrent requests for the same key share one slot.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[list[K]], dict[K, V]],
+        max_batch: int = 100,
+        max_wait_ms: float = 50
+    ):
+        self.loader = loader
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: dict[K, Future] = {}
+        # Deadline of the open window, or None when no window is open
+        self._deadline: Optional[float] = None
+        self._cond = threading.Condition()
+        self._flusher: Optional[threading.Thread] = None
+
+    def load(self, key: K) -> Optional[V]:
+        """Return the value for key, or None if the loader did not find it"""
+        flush_now = None
+        with self._cond:
+            future = self._pending.get(key)
+            if future is None:
+                future = Future()
+                self._pending[key] = future
+                if len(self._pending) == 1:
+                    self._deadline = time.monotonic() + self.max_wait
+                    self._start_flusher()
+                    self._cond.notify()
+                if len(self._pending) >= self.max_batch:
+                    flush_now, self._pending = self._pending, {}
+                    self._deadline = None
+        if flush_now:
+            self._run(flush_now)
+        return future.result()
+
+    def _start_flusher(self) -> None:
+        # Started lazily so each worker process gets its own thread
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_windows, daemon=True)
+            self._flusher.start()
+
+    def _flush_windows(self) -> None:
+        """Flush each window at its deadline (one thread for all windows)
+
+        The deadline is re-read after every wait, so a window that was
+        flushed in line at max_batch is never flushed early by a stale wakeup.
+        """
+        while True:
+            with self._cond:
+                while self._deadline is None:
+                    self._cond.wait()
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                batch, self._pending = self._pending, {}
+                self._deadline = None
+            if batch:
+                self._run(batch)
+
+    def _run(self, batch: dict[K, Future]) -> None:
+        try:
+            values = self.loader(list(batch))
+        except BaseException as exc:
+            for future in batch.values():
+                future.set_exception(exc)
+            return
+        for key, future in batch.items():
+            future.set_result(values.get(key))
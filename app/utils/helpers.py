@@ -0,0 +1,53 @@
+"""Shared helper utilities"""
+
+import base64
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a keyset pagination position as an opaque URL-safe cursor"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor
+
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (UnicodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def make_etag(*parts: object) -> str:
+    """Build a weak ETag from values that change whenever the resource does"""
+    digest = hashlib.blake2b(
+        "|".join(map(str, parts)).encode("utf-8"), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def schema_example(example: dict) -> Optional[dict]:
+    """Attach an OpenAPI example to a schema only when DEBUG is on"""
+    return {"example": example} if settings.DEBUG else None
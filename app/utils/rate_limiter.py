@@ -1,16 +1,105 @@
 """Rate limiting configuration and utilities"""
 
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
 from app.core.config import settings
+from app.core.middleware import resolve_client_ip
 
-# Create limiter instance
-limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=[settings.RATE_LIMIT_DEFAULT]
-)
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE_PATTERN = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+def parse_rate(rate: str) -> tuple[float, float]:
+    """Parse a limit like "100/minute" into (capacity, refill per second)"""
+    match = _RATE_PATTERN.match(rate.lower())
+    if not match:
+        raise ValueError(f"Invalid rate limit: {rate!r}")
+    amount, multiplier, period = match.groups()
+    seconds = int(multiplier or 1) * _PERIODS[period]
+    return float(amount), int(amount) / seconds
 
 
 class RateLimitExceeded(Exception):
     """Rate limit exceeded exception"""
-    pass
+
+    def __init__(self, retry_after: float):
+        super().__init__("Rate limit exceeded")
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """In-process token bucket per key
+
+    Buckets are kept in LRU order and the least recently seen keys are
+    dropped once max_keys is reached.
+    """
+
+    def __init__(self, rate: str, max_keys: int = 100_000):
+        self.capacity, self.refill_rate = parse_rate(rate)
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, key: str) -> None:
+        """Take one token for key, raising RateLimitExceeded if none are left"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            if bucket is None:
+                tokens = self.capacity
+            else:
+                tokens, last = bucket
+                tokens = min(self.capacity, tokens + (now - last) * self.refill_rate)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        if not allowed:
+            raise RateLimitExceeded(retry_after=(1 - tokens) / self.refill_rate)
+
+
+# Create limiter instance
+limiter = TokenBucketLimiter(settings.RATE_LIMIT_DEFAULT)
+
+
+def check(ip: str) -> None:
+    """Apply the default rate limit to a client IP"""
+    limiter.check(ip)
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying the default limit to every HTTP request
+
+    Keys on the IP resolved by ClientIPMiddleware when it runs first.
+    """
+
+    def __init__(self, app: ASGIApp, exempt_paths: Iterable[str] = ()):
+        self.app = app
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] not in self.exempt_paths:
+            client_ip = scope.get("state", {}).get("client_ip") or resolve_client_ip(scope)
+            try:
+                check(client_ip)
+            except RateLimitExceeded as exc:
+                response = ORJSONResponse(
+                    status_code=429,
+                    content={"success": False, "error": "Rate limit exceeded"},
+                    headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
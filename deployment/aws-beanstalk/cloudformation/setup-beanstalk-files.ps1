@@ -27,7 +27,7 @@ Write-Host "  application.py created" -ForegroundColor Green
 
 # Create Procfile
 Write-Host "Creating Procfile..." -ForegroundColor Cyan
-$procfileContent = "web: uvicorn application:application --host 0.0.0.0 --port 8000"
+$procfileContent = "web: uvicorn application:application --host 0.0.0.0 --port 8000 --loop uvloop --http httptools --timeout-keep-alive 75"
 $procfileContent | Out-File -FilePath "Procfile" -Encoding utf8 -NoNewline
 Write-Host "  Procfile created" -ForegroundColor Green
 
@@ -1,5 +1,5 @@
 from mangum import Mangum
 from app.main import app
 
-# Mangum adapter for Lambda
-handler = Mangum(app, lifespan="off")
\ No newline at end of file
+# Mangum adapter for Lambda; runs the app lifespan so shared clients exist
+handler = Mangum(app, lifespan="auto")
\ No newline at end of file
@@ -10,7 +10,7 @@ This script:
 2. Seeds initial test users (admin and regular user)
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
 import os
 import sys
@@ -45,45 +45,44 @@ def seed_data(engine):
     Session = sessionmaker(bind=engine)
     session = Session()
     
+    seed_users = [
+        {
+            "email": "admin@example.com",
+            "full_name": "Admin User",
+            "hashed_password": "AUTH_DISABLED",
+            "is_active": True,
+            "is_superuser": True
+        },
+        {
+            "email": "test@example.com",
+            "full_name": "Test User",
+            "hashed_password": "AUTH_DISABLED",
+            "is_active": True,
+            "is_superuser": False
+        },
+    ]
+    
     try:
-        # Check if user exists
-        existing_user = session.query(User).filter_by(email="admin@example.com").first()
-        if existing_user:
-            print("⚠️  Admin user already exists, skipping seeding")
+        # Skip users that already exist
+        existing_emails = set(session.execute(
+            select(User.email).where(User.email.in_([u["email"] for u in seed_users]))
+        ).scalars().all())
+        new_users = [u for u in seed_users if u["email"] not in existing_emails]
+        if not new_users:
+            print("⚠️  Seed users already exist, skipping seeding")
             return
         
-        # Create admin user
-        admin_user = User(
-            email="admin@example.com",
-            full_name="Admin User",
-            hashed_password="AUTH_DISABLED",
-            is_active=True,
-            is_superuser=True
-        )
-        session.add(admin_user)
-        session.flush()
-        
-        print(f"✅ Created admin user: admin@example.com")
-        
-        # Create test user
-        test_user = User(
-            email="test@example.com",
-            full_name="Test User",
-            hashed_password="AUTH_DISABLED",
-            is_active=True,
-            is_superuser=False
-        )
-        session.add(test_user)
-        session.flush()
-        
-        print(f"✅ Created test user: test@example.com")
-        
+        # One multi-row INSERT without per-instance unit-of-work overhead
+        session.bulk_insert_mappings(User, new_users)
         session.commit()
+        
+        for user in new_users:
+            print(f"✅ Created user: {user['email']}")
         print("\n✅ Database seeding completed successfully!")
         
         print("\n📋 Test Users:")
-        print("  Admin User: admin@example.com")
-        print("  Test User: test@example.com")
+        for user in seed_users:
+            print(f"  {user['full_name']}: {user['email']}")
         
     except Exception as e:
         session.rollback()